@@ -12,6 +12,7 @@ import importlib.util
 import sys
 from pathlib import Path
 from types import ModuleType
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
@@ -28,6 +29,37 @@ def load_script_module(relative_path: str, module_name: str) -> ModuleType:
     return module
 
 
+class InProcessPoolExecutor:
+    """Run ``ProcessPoolExecutor`` work in the test process.
+
+    Scripts loaded through ``load_script_module`` are registered under names
+    that spawned workers (the default start method on Windows and macOS)
+    cannot import, so tests swap this in to exercise the pool wiring
+    (initializer, ``map`` ordering, worker arguments) without a real fork.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        initializer: Optional[Callable[..., object]] = None,
+        initargs: Tuple[Any, ...] = (),
+    ) -> None:
+        self.max_workers = max_workers
+        if initializer is not None:
+            initializer(*initargs)
+
+    def __enter__(self) -> "InProcessPoolExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def map(
+        self, fn: Callable[..., Any], *iterables: Iterable[Any], chunksize: int = 1
+    ) -> Iterator[Any]:
+        return map(fn, *iterables)
+
+
 # Loading one scripts/quality module triggers its self-bootstrap, which inserts
 # the repo's ``scripts`` dir onto sys.path so ``from security_helpers import ...``
 # resolves for every test (including the direct import in test_security_helpers).
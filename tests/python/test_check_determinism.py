@@ -51,13 +51,35 @@ def test_trusted_emitter_path_rejects_wrong_name(tmp_path: Path) -> None:
         mod._trusted_emitter_path(bad)
 
 
+def test_trusted_paths_are_memoized() -> None:
+    assert mod._trusted_python_executable() is mod._trusted_python_executable()
+    first = mod._trusted_emitter_path(EMITTER)
+    assert mod._trusted_emitter_path(EMITTER) is first
+    assert mod._trusted_emitter_path.cache_info().hits >= 1
+
+
 def test_validate_emitter_command_length() -> None:
     with pytest.raises(ValueError, match="length"):
         mod._validate_emitter_command(("a", "b"))
 
 
 def test_validate_emitter_command_flags() -> None:
-    command = ("py", "emit", "--wrong", "v", "--x", "v", "--y", "v", "--z", "v", "--w", "v")
+    command = (
+        "py",
+        "emit",
+        "--wrong",
+        "v",
+        "--x",
+        "v",
+        "--y",
+        "v",
+        "--z",
+        "v",
+        "--w",
+        "v",
+        "--v",
+        "v",
+    )
     with pytest.raises(ValueError, match="flags"):
         mod._validate_emitter_command(command)
 
@@ -114,14 +136,25 @@ def test_normalize_pack_for_compare_strips_volatile() -> None:
     pack = {"buildMetadata": {"analysisRunId": "x", "generatedAtUtc": "t", "keep": 1}}
     out = mod._normalize_pack_for_compare(pack)
     assert out["buildMetadata"] == {"keep": 1}
+    assert pack["buildMetadata"] == {"analysisRunId": "x", "generatedAtUtc": "t", "keep": 1}
 
 
-def test_is_pack_match(tmp_path: Path) -> None:
+def test_pack_fingerprint_ignores_run_metadata(tmp_path: Path) -> None:
     a = tmp_path / "a.json"
     b = tmp_path / "b.json"
     a.write_text(json.dumps({"buildMetadata": {"analysisRunId": "1"}, "x": 1}), encoding="utf-8")
     b.write_text(json.dumps({"buildMetadata": {"analysisRunId": "2"}, "x": 1}), encoding="utf-8")
-    assert mod._is_pack_match(a, b) is True
+    assert mod._pack_fingerprint(a) == mod._pack_fingerprint(b)
+
+
+def test_pack_fingerprint_detects_difference(tmp_path: Path) -> None:
+    a = tmp_path / "a.json"
+    b = tmp_path / "b.json"
+    a.write_text(json.dumps({"x": 1, "y": [1, 2]}), encoding="utf-8")
+    b.write_text(json.dumps({"y": [2, 1], "x": 1}), encoding="utf-8")
+    assert mod._pack_fingerprint(a) != mod._pack_fingerprint(b)
+    b.write_text(json.dumps({"y": [1, 2], "x": 1}), encoding="utf-8")
+    assert mod._pack_fingerprint(a) == mod._pack_fingerprint(b)
 
 
 def test_main_deterministic_pass(tmp_path: Path, monkeypatch, capsys) -> None:
@@ -144,13 +177,34 @@ def test_main_deterministic_pass(tmp_path: Path, monkeypatch, capsys) -> None:
     assert mod.main() == 0
     report = json.loads((out_dir / "determinism-report.json").read_text(encoding="utf-8"))
     assert report["deterministic"] is True
+    assert report["firstPackFingerprint"] == report["secondPackFingerprint"]
     assert "passed" in capsys.readouterr().out
 
 
+def test_run_emitter_reuses_loaded_main(tmp_path: Path, monkeypatch) -> None:
+    script = tmp_path / "emit-symbol-pack.py"
+    script.write_text("def main():\n    return 0\n", encoding="utf-8")
+    raw = tmp_path / "raw.json"
+    raw.write_text("{}", encoding="utf-8")
+    binary = tmp_path / "bin.exe"
+    binary.write_text("b", encoding="utf-8")
+    loads: list[Path] = []
+    real_load = mod._load_emitter_main
+
+    def _counting_load(path: Path):
+        loads.append(path)
+        return real_load(path)
+
+    monkeypatch.setattr(mod, "_load_emitter_main", _counting_load)
+    for run_id in ("rid-a", "rid-b"):
+        mod._run_emitter(script, raw, binary, run_id, tmp_path / "p.json", tmp_path / "s.json")
+    assert loads == [script.resolve()]
+
+
 def test_main_mismatch_raises(tmp_path: Path, monkeypatch) -> None:
     raw, binary = _make_inputs(tmp_path)
     out_dir = tmp_path / "out"
-    monkeypatch.setattr(mod, "_is_pack_match", lambda *a: False)
+    monkeypatch.setattr(mod, "_pack_fingerprint", lambda path: path.name)
     monkeypatch.setattr(
         "sys.argv",
         [
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import pytest
-from conftest import load_script_module
+from conftest import InProcessPoolExecutor, load_script_module
 
 mod = load_script_module("tools/detect-launch-context.py", "detect_launch_context")
 
@@ -24,11 +25,15 @@ def test_normalize_token() -> None:
     assert mod.normalize_token(None) is None
     assert mod.normalize_token("") is None
     assert mod.normalize_token('  "D:\\\\A//B"  ') == "d:/a/b"
+    assert mod.normalize_token("Mods\\\\\\//RoE////Data") == "mods/roe/data"
 
 
 def test_parse_steammod_ids() -> None:
     assert mod.parse_steammod_ids(None) == []
     assert mod.parse_steammod_ids("STEAMMOD=123 steammod = 456") == ["123", "456"]
+    assert mod.parse_steammod_ids("StarWarsG.exe MODPATH=Mods/X") == []
+    line = "StarWarsG.exe STEAMMOD=789"
+    assert mod.parse_steammod_ids(line, line.lower()) == ["789"]
 
 
 def test_parse_forced_workshop_ids() -> None:
@@ -39,8 +44,21 @@ def test_parse_forced_workshop_ids() -> None:
 def test_parse_modpath() -> None:
     assert mod.parse_modpath(None) is None
     assert mod.parse_modpath("nomod here") is None
+    assert mod.parse_modpath("modpath missing equals") is None
     assert mod.parse_modpath('MODPATH="My Mod/Dir"') == "My Mod/Dir"
     assert mod.parse_modpath("modpath=Mods/X") == "Mods/X"
+    line = "StarWarsG.exe MODPATH=Mods/RoE"
+    assert mod.parse_modpath(line, line.lower()) == "Mods/RoE"
+
+
+def test_parse_modpath_skips_keyword_without_assignment() -> None:
+    line = 'StarWarsG.exe -modpath_note MODPATH="Mods/RoE Dir"'
+    assert mod.parse_modpath(line) == "Mods/RoE Dir"
+
+
+def test_parse_modpath_length_changing_lowercase() -> None:
+    # "\u0130".lower() is two code points, so offsets from the lowered copy drift.
+    assert mod.parse_modpath("\u0130 MODPATH=Mods/X") == "Mods/X"
 
 
 def test_parse_modpath_empty_value() -> None:
@@ -66,6 +84,15 @@ def test_detect_exe_hint() -> None:
     assert mod.detect_exe_hint(None, "C:/swfoc.exe", None) == "swfoc"
     assert mod.detect_exe_hint(None, None, "run StarWarsG.exe") == "starwarsg"
     assert mod.detect_exe_hint("game", None, None) == "unknown"
+    line = "run StarWarsG.exe"
+    assert mod.detect_exe_hint("game", None, line, line.lower()) == "starwarsg"
+
+
+def test_detect_exe_hint_is_memoized() -> None:
+    mod.detect_exe_hint.cache_clear()
+    mod.detect_exe_hint("StarWarsG", "C:/g/StarWarsG.exe", None)
+    mod.detect_exe_hint("StarWarsG", "C:/g/StarWarsG.exe", None)
+    assert mod.detect_exe_hint.cache_info().hits == 1
 
 
 def test_gather_hints() -> None:
@@ -80,6 +107,16 @@ def test_gather_hints() -> None:
     assert "mods/roe" in hints
 
 
+def test_profile_info_caches_derived_lookups() -> None:
+    p = _profile("ROE_X", steam_workshop_id="10", metadata={"requiredWorkshopIds": "20,10"})
+    assert p.hints == tuple(mod.gather_hints(p))
+    assert p.required_ids == ("10", "20")
+    assert p.csv_cache == {"requiredWorkshopIds": ("20", "10")}
+    assert not hasattr(p, "__dict__")
+    with pytest.raises(AttributeError):
+        p.profile_id = "other"  # type: ignore[misc]
+
+
 def test_gather_hints_skips_unnormalizable() -> None:
     # '""' normalizes to '' (falsy) and is skipped; only the profile id remains.
     p = _profile("p", metadata={"localPathHints": '""'})
@@ -101,6 +138,14 @@ def test_profile_sort_priority() -> None:
     assert mod.profile_sort_priority("roe_x") == 0
     assert mod.profile_sort_priority("aotr_x") == 1
     assert mod.profile_sort_priority("base_x") == 2
+    assert mod.profile_sort_priority("ROE_X") == 0
+
+
+def test_profile_info_precomputes_priority() -> None:
+    p = _profile("AOTR_X")
+    assert p.profile_id_lower == "aotr_x"
+    assert p.sort_bucket == 1
+    assert mod.profile_priority_key(p) == (1, "AOTR_X")
 
 
 def test_required_workshop_ids() -> None:
@@ -126,7 +171,7 @@ def test_score_workshop_match() -> None:
 
 
 def test_steam_profile_match_none_when_no_ids() -> None:
-    assert mod.steam_profile_match({"a": _profile("a")}, []) is None
+    assert mod.steam_profile_match({"a": _profile("a")}, set()) is None
 
 
 def test_steam_profile_match_picks_best() -> None:
@@ -134,19 +179,19 @@ def test_steam_profile_match_picks_best() -> None:
         "low": _profile("low", metadata={"requiredWorkshopIds": "10"}),
         "high": _profile("high", steam_workshop_id="10"),
     }
-    best = mod.steam_profile_match(profiles, ["10"])
+    best = mod.steam_profile_match(profiles, {"10"})
     assert best is not None and best.profile_id == "high"
 
 
 def test_steam_profile_match_skips_zero_score() -> None:
-    # A non-matching profile (score 0) is skipped both before AND after a match is
-    # found, exercising the continue-loops-back branch in either iteration order.
+    # Non-matching profiles placed before AND after the match never become
+    # candidates, since the workshop index only yields profiles referencing a launch id.
     profiles = {
         "nomatch1": _profile("nomatch1", steam_workshop_id="999"),
         "match": _profile("match", steam_workshop_id="10"),
         "nomatch2": _profile("nomatch2", steam_workshop_id="888"),
     }
-    best = mod.steam_profile_match(profiles, ["10"])
+    best = mod.steam_profile_match(profiles, {"10"})
     assert best is not None and best.profile_id == "match"
 
 
@@ -157,7 +202,7 @@ def test_steam_profile_match_worse_candidate_not_chosen() -> None:
         "best": _profile("aotr_best", steam_workshop_id="10"),  # direct match, score 1000
         "worse": _profile("aotr_worse", metadata={"requiredWorkshopIds": "10"}),  # score 902
     }
-    best = mod.steam_profile_match(profiles, ["10"])
+    best = mod.steam_profile_match(profiles, {"10"})
     assert best is not None and best.profile_id == "aotr_best"
 
 
@@ -168,7 +213,7 @@ def test_steam_profile_match_tiebreak_required_count() -> None:
         "a": _profile("aotr_a", steam_workshop_id="10"),
         "b": _profile("aotr_b", steam_workshop_id="10", metadata={"requiredWorkshopIds": "20,30"}),
     }
-    best = mod.steam_profile_match(profiles, ["10"])
+    best = mod.steam_profile_match(profiles, {"10"})
     assert best is not None and best.profile_id == "aotr_b"
 
 
@@ -178,10 +223,41 @@ def test_steam_profile_match_tiebreak_priority_key() -> None:
         "z": _profile("aotr_z", steam_workshop_id="10"),
         "a": _profile("roe_a", steam_workshop_id="10"),
     }
-    best = mod.steam_profile_match(profiles, ["10"])
+    best = mod.steam_profile_match(profiles, {"10"})
     assert best is not None and best.profile_id == "roe_a"
 
 
+def test_build_profile_index_maps_required_ids() -> None:
+    profiles = {
+        "a": _profile("roe_a", steam_workshop_id="10", metadata={"requiredWorkshopIds": "20"}),
+        "b": _profile("aotr_b", metadata={"requiredWorkshopIds": "20"}),
+        "c": _profile("base_c"),
+    }
+    index = mod.build_profile_index(profiles)
+    assert index.workshop == {"10": ("a",), "20": ("a", "b")}
+
+
+def test_build_profile_index_orders_hints_longest_first() -> None:
+    profiles = {
+        "a": _profile("roe_a", metadata={"localPathHints": "Mods/RoE"}),
+        "b": _profile("b", metadata={"profileAliases": "roe_a"}),
+        "blank": _profile(""),
+    }
+    index = mod.build_profile_index(profiles)
+    assert index.hints == (("mods/roe", ("a",)), ("roe_a", ("a", "b")), ("b", ("b",)))
+
+
+def test_steam_profile_match_with_shared_index() -> None:
+    profiles = {
+        "a": _profile("roe_a", steam_workshop_id="10", metadata={"requiredWorkshopIds": "20"}),
+        "b": _profile("aotr_b", steam_workshop_id="20"),
+    }
+    index = mod.build_profile_index(profiles)
+    best = mod.steam_profile_match(profiles, {"10", "20"}, index)
+    assert best is not None and best.profile_id == "roe_a"
+    assert mod.steam_profile_match(profiles, {"99"}, index) is None
+
+
 def test_best_modpath_match() -> None:
     profiles = {
         "roe": _profile("roe_mod", metadata={"localPathHints": "RoE"}),
@@ -191,6 +267,18 @@ def test_best_modpath_match() -> None:
     assert best is not None and best.profile_id == "roe_mod"
 
 
+def test_best_modpath_match_longest_hint_then_priority() -> None:
+    profiles = {
+        "short": _profile("roe_short", metadata={"localPathHints": "RoE"}),
+        "aotr": _profile("aotr_long", metadata={"localPathHints": "Mods/RoE"}),
+        "base": _profile("base_long", metadata={"localPathHints": "mods/roe"}),
+        "roe": _profile("roe_long", metadata={"profileAliases": "mods/roe"}),
+    }
+    index = mod.build_profile_index(profiles)
+    best = mod.best_modpath_match(profiles, "c:/games/mods/roe/data", index)
+    assert best is not None and best.profile_id == "roe_long"
+
+
 def test_best_modpath_match_none() -> None:
     assert mod.best_modpath_match({"x": _profile("zzz")}, "nomatch") is None
 
@@ -300,6 +388,11 @@ def test_detect_one_detected() -> None:
     assert result["profileRecommendation"]["profileId"] == "roe_p"
 
 
+def test_detect_one_uses_supplied_timestamp() -> None:
+    result = mod.detect_one({"processName": "game.exe"}, {}, generated_at="2026-01-01T00:00:00")
+    assert result["generatedAtUtc"] == "2026-01-01T00:00:00"
+
+
 def test_detect_one_none_command_line() -> None:
     result = mod.detect_one({"commandLine": None, "name": None}, {})
     assert result["input"]["commandLine"] is None
@@ -344,6 +437,27 @@ def test_load_profiles_basic(tmp_path: Path) -> None:
     assert profiles["roe_p"].steam_workshop_id == "10"
 
 
+def test_load_profiles_skips_hidden_and_non_file_entries(tmp_path: Path) -> None:
+    _write_profiles(tmp_path, [{"id": "b_p", "exeTarget": "x"}, {"id": "a_p", "exeTarget": "x"}])
+    pdir = tmp_path / "profiles"
+    (pdir / ".hidden.json").write_text(json.dumps({"id": "hidden"}), encoding="utf-8")
+    (pdir / "nested.json").mkdir()
+    (pdir / "notes.txt").write_text("{}", encoding="utf-8")
+    profiles = mod.load_profiles(tmp_path)
+    assert list(profiles) == ["a_p", "b_p"]
+
+
+def test_load_profiles_extension_follows_normcase(tmp_path: Path, monkeypatch) -> None:
+    _write_profiles(tmp_path, [{"id": "a_p", "exeTarget": "x"}])
+    pdir = tmp_path / "profiles"
+    (pdir / "UPPER.JSON").write_text(json.dumps({"id": "upper_p"}), encoding="utf-8")
+    assert list(mod.load_profiles(tmp_path)) == (
+        ["upper_p", "a_p"] if os.path.normcase("A") == "a" else ["a_p"]
+    )
+    monkeypatch.setattr(mod.os.path, "normcase", str.lower)
+    assert list(mod.load_profiles(tmp_path)) == ["upper_p", "a_p"]
+
+
 def test_load_profiles_with_manifest_filter(tmp_path: Path) -> None:
     _write_profiles(
         tmp_path,
@@ -447,8 +561,37 @@ def test_main_from_json(tmp_path: Path, monkeypatch, capsys) -> None:
         ],
     )
     assert mod.main() == 0
-    out = json.loads(capsys.readouterr().out)
-    assert len(out["results"]) == 2
+    captured = capsys.readouterr()
+    out = json.loads(captured.out)
+    # The non-object "bad" case is dropped with a warning instead of yielding an empty result.
+    assert len(out["results"]) == 1
+    assert "skipped 1 non-object case(s)" in captured.err
+    assert {r["generatedAtUtc"] for r in out["results"]} == {out["generatedAtUtc"]}
+
+
+def test_build_multi_case_output_parallel_matches_serial(monkeypatch) -> None:
+    profiles = {"p": _profile("roe_p", steam_workshop_id="10")}
+    payload = {"cases": [{"name": f"c{i}", "commandLine": "g STEAMMOD=10"} for i in range(5)]}
+    serial = mod._build_multi_case_output(payload, profiles, [], None)
+    monkeypatch.setattr(mod, "PARALLEL_CASE_THRESHOLD", 2)
+    monkeypatch.setattr(mod, "PARALLEL_CHUNK_SIZE", 2)
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", InProcessPoolExecutor)
+    try:
+        parallel = mod._build_multi_case_output(payload, profiles, [], None)
+    finally:
+        mod._WORKER_STATE.clear()
+    assert [r["input"]["name"] for r in parallel["results"]] == [f"c{i}" for i in range(5)]
+    assert [r["profileRecommendation"] for r in parallel["results"]] == [
+        r["profileRecommendation"] for r in serial["results"]
+    ]
+
+
+def test_case_worker_uses_initialized_detector() -> None:
+    mod._init_case_worker(lambda case: {"echo": case["name"]})
+    try:
+        assert mod._detect_in_worker({"name": "c"}) == {"echo": "c"}
+    finally:
+        mod._WORKER_STATE.clear()
 
 
 def test_main_from_json_invalid(tmp_path: Path, monkeypatch) -> None:
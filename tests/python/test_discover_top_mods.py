@@ -6,6 +6,7 @@ import contextlib
 import io
 import json
 from pathlib import Path
+from urllib.parse import parse_qs
 
 import pytest
 from conftest import load_script_module
@@ -31,6 +32,9 @@ def test_clamp_confidence() -> None:
 
 def test_normalize_tag() -> None:
     assert mod.normalize_tag("  Total Conversion! ") == "total_conversion"
+    before = mod.normalize_tag.cache_info().hits
+    assert mod.normalize_tag("  Total Conversion! ") == "total_conversion"
+    assert mod.normalize_tag.cache_info().hits == before + 1
 
 
 def test_unique_ordered() -> None:
@@ -73,35 +77,35 @@ def test_parse_normalized_tags_skips_empty_normalized() -> None:
 
 
 def test_infer_candidate_base_profile() -> None:
-    assert mod.infer_candidate_base_profile("x", [], ["3447786229"]) == "roe_3447786229_swfoc"
-    assert mod.infer_candidate_base_profile("x", [], ["1397421866"]) == "aotr_1397421866_swfoc"
-    assert mod.infer_candidate_base_profile("Order 66 mod", [], []) == "roe_3447786229_swfoc"
-    assert mod.infer_candidate_base_profile("Awakening", [], []) == "aotr_1397421866_swfoc"
-    assert mod.infer_candidate_base_profile("x", ["eaw"], []) == "base_sweaw"
-    assert mod.infer_candidate_base_profile("x", [], []) == "base_swfoc"
+    assert mod.infer_candidate_base_profile("x", set(), ["3447786229"]) == "roe_3447786229_swfoc"
+    assert mod.infer_candidate_base_profile("x", set(), ["1397421866"]) == "aotr_1397421866_swfoc"
+    assert mod.infer_candidate_base_profile("order 66 mod", set(), []) == "roe_3447786229_swfoc"
+    assert mod.infer_candidate_base_profile("awakening", set(), []) == "aotr_1397421866_swfoc"
+    assert mod.infer_candidate_base_profile("x", {"eaw"}, []) == "base_sweaw"
+    assert mod.infer_candidate_base_profile("x", set(), []) == "base_swfoc"
 
 
 def test_infer_launch_hints() -> None:
-    hints = mod.infer_launch_hints("base_sweaw", ["1"], ["campaign", "tactical", "multiplayer"])
+    hints = mod.infer_launch_hints("base_sweaw", ["1"], {"campaign", "tactical", "multiplayer"})
     assert "launch_sweaw" in hints
     assert "requires_parent_mod" in hints
     assert "galactic_campaign" in hints
     assert "tactical_profile" in hints
     assert "manual_smoke_required" in hints
-    assert "launch_swfoc" in mod.infer_launch_hints("base_swfoc", [], [])
+    assert "launch_swfoc" in mod.infer_launch_hints("base_swfoc", [], set())
 
 
 def test_infer_risk_level() -> None:
-    assert mod.infer_risk_level(["beta"], [], 0) == "high"
-    assert mod.infer_risk_level([], ["dep"], 0) == "medium"
-    assert mod.infer_risk_level(["multiplayer"], [], 100) == "medium"
-    assert mod.infer_risk_level([], [], 100000) == "low"
+    assert mod.infer_risk_level({"beta"}, [], 0) == "high"
+    assert mod.infer_risk_level(set(), ["dep"], 0) == "medium"
+    assert mod.infer_risk_level({"multiplayer"}, [], 100) == "medium"
+    assert mod.infer_risk_level(set(), [], 100000) == "low"
 
 
 def test_infer_confidence() -> None:
-    score = mod.infer_confidence("AOTR", ["t"], ["d"], "aotr_1397421866_swfoc", 20000)
+    score = mod.infer_confidence("aotr", ["t"], ["d"], "aotr_1397421866_swfoc", 20000)
     assert score == 1.0  # capped
-    low = mod.infer_confidence("Plain", [], [], "base_swfoc", 0)
+    low = mod.infer_confidence("plain", [], [], "base_swfoc", 0)
     assert low == 0.55
 
 
@@ -118,6 +122,17 @@ def test_normalize_mod_from_detail_minimal() -> None:
     assert out["candidateBaseProfile"] == "base_swfoc"
 
 
+def test_normalize_mod_from_detail_mixed_case_title() -> None:
+    out = mod.normalize_mod_from_detail(
+        {"publishedfileid": "7", "title": "Awakening of the Rebels"}
+    )
+    assert out is not None
+    assert out["candidateBaseProfile"] == "aotr_1397421866_swfoc"
+    assert out["confidence"] == mod.infer_confidence(
+        "awakening of the rebels", [], [], "aotr_1397421866_swfoc", 0
+    )
+
+
 def test_normalize_mod_from_detail_invalid() -> None:
     assert mod.normalize_mod_from_detail({"publishedfileid": "abc"}) is None
 
@@ -204,8 +219,9 @@ def test_load_source_payload_unsupported(tmp_path: Path) -> None:
 
 
 class _FakeResp:
-    def __init__(self, payload: bytes) -> None:
+    def __init__(self, payload: bytes, headers: dict[str, str] | None = None) -> None:
         self._payload = payload
+        self.headers = headers or {}
 
     def read(self) -> bytes:
         return self._payload
@@ -241,6 +257,148 @@ def test_scrape_workshop_ids_error(monkeypatch) -> None:
     assert "failed to scrape" in err.getvalue()
 
 
+def test_scrape_workshop_ids_merges_pages_in_order(monkeypatch) -> None:
+    pages = {
+        "1": b"sharedfiles/filedetails/?id=333 sharedfiles/filedetails/?id=111",
+        "2": b"sharedfiles/filedetails/?id=111 sharedfiles/filedetails/?id=222",
+        "3": b"",
+    }
+    monkeypatch.setattr(
+        mod.request, "urlopen", lambda req, timeout: _FakeResp(pages[req.full_url[-1]])
+    )
+    ids, sources = mod.scrape_workshop_ids(32470, 3, 1.0)
+    assert ids == ["333", "111", "222"]
+    assert [s["uri"][-1] for s in sources] == ["1", "2", "3"]
+    assert mod.scrape_workshop_ids(32470, 0, 1.0) == ([], [])
+
+
+def test_read_response_uses_fresh_cache(tmp_path: Path, monkeypatch) -> None:
+    cache = mod.ResponseCache(tmp_path / "cache", 60.0)
+    calls: list[str] = []
+
+    def fake(req, timeout):
+        calls.append(req.full_url)
+        return _FakeResp(b"payload")
+
+    monkeypatch.setattr(mod.request, "urlopen", fake)
+    get = mod.request.Request("https://example.test/a")
+    post = mod.request.Request("https://example.test/a", data=b"x=1", method="POST")
+    assert mod.read_response(get, 1.0, bytes, cache) == b"payload"
+    assert mod.read_response(get, 1.0, bytes, cache) == b"payload"
+    assert mod.read_response(post, 1.0, bytes, cache) == b"payload"
+    assert len(calls) == 2
+    assert cache.path_for(get) != cache.path_for(post)
+
+    stale = mod.ResponseCache(tmp_path / "cache", -1.0)
+    assert stale.load(get) is None
+    assert mod.read_response(get, 1.0, bytes) == b"payload"
+    assert len(calls) == 3
+
+
+def test_read_response_revalidates_stale_entry_with_etag(tmp_path: Path, monkeypatch) -> None:
+    cache = mod.ResponseCache(tmp_path / "cache", -1.0)
+    sent: list[str | None] = []
+    replies = iter(["fresh", "not-modified", "not-modified-no-etag", "gone"])
+
+    def fake(req, timeout):
+        sent.append(req.get_header("If-none-match"))
+        reply = next(replies)
+        if reply == "fresh":
+            return _FakeResp(b"body", {"ETag": '"v1"'})
+        if reply == "not-modified":
+            raise mod.error.HTTPError(req.full_url, 304, "Not Modified", {"ETag": '"v2"'}, None)
+        if reply == "not-modified-no-etag":
+            raise mod.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+        raise mod.error.HTTPError(req.full_url, 404, "Not Found", {}, None)
+
+    monkeypatch.setattr(mod.request, "urlopen", fake)
+
+    def new_req():
+        return mod.request.Request("https://example.test/e")
+
+    assert mod.read_response(new_req(), 1.0, bytes, cache) == b"body"
+    assert cache.load_etag(new_req()) == '"v1"'
+    assert mod.read_response(new_req(), 1.0, bytes, cache) == b"body"
+    assert cache.load_etag(new_req()) == '"v2"'
+    assert mod.read_response(new_req(), 1.0, bytes, cache) == b"body"
+    assert cache.load_etag(new_req()) == '"v2"'
+    with pytest.raises(mod.error.HTTPError):
+        mod.read_response(new_req(), 1.0, bytes, cache)
+    assert sent == [None, '"v1"', '"v2"', '"v2"']
+
+
+def test_read_response_without_usable_etag_refetches(tmp_path: Path, monkeypatch) -> None:
+    cache = mod.ResponseCache(tmp_path / "cache", -1.0)
+    req = mod.request.Request("https://example.test/f")
+    cache.store(req, b"old", '"v1"')
+    cache.path_for(req).unlink()
+    assert cache.load_etag(req) == '"v1"'
+
+    def not_modified(req, timeout):
+        assert req.get_header("If-none-match") is None
+        raise mod.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+
+    monkeypatch.setattr(mod.request, "urlopen", not_modified)
+    with pytest.raises(mod.error.HTTPError):
+        mod.read_response(req, 1.0, bytes, cache)
+
+    monkeypatch.setattr(mod.request, "urlopen", lambda req, timeout: _FakeResp(b"new"))
+    assert mod.read_response(req, 1.0, bytes, cache) == b"new"
+    assert cache.load_etag(req) is None
+    assert cache.load(req, allow_stale=True) == b"new"
+
+
+def test_read_response_caches_only_decodable_bodies(tmp_path: Path, monkeypatch) -> None:
+    cache = mod.ResponseCache(tmp_path / "cache", 60.0)
+    bodies = iter([b"<html>busy</html>", b'{"ok": 1}'])
+    monkeypatch.setattr(mod.request, "urlopen", lambda req, timeout: _FakeResp(next(bodies)))
+    req = mod.request.Request("https://example.test/j", data=b"x=1", method="POST")
+    with pytest.raises(ValueError):
+        mod.read_response(req, 1.0, json.loads, cache)
+    assert cache.load(req) is None
+    assert mod.read_response(req, 1.0, json.loads, cache) == {"ok": 1}
+    assert cache.load(req) == b'{"ok": 1}'
+
+
+def test_read_response_refetches_undecodable_cache_entry(tmp_path: Path, monkeypatch) -> None:
+    cache = mod.ResponseCache(tmp_path / "cache", 60.0)
+    req = mod.request.Request("https://example.test/k")
+    cache.store(req, b"truncated {", '"v1"')
+
+    def fetch(req, timeout):
+        assert req.get_header("If-none-match") is None
+        return _FakeResp(b"[1]")
+
+    monkeypatch.setattr(mod.request, "urlopen", fetch)
+    assert mod.read_response(req, 1.0, json.loads, cache) == [1]
+    assert cache.load(req) == b"[1]"
+    assert cache.load_etag(req) is None
+
+
+def test_response_cache_store_is_atomic(tmp_path: Path, monkeypatch) -> None:
+    cache = mod.ResponseCache(tmp_path / "cache", 60.0)
+    req = mod.request.Request("https://example.test/m")
+    cache.store(req, b"old", '"v1"')
+
+    def fail_replace(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(mod.os, "replace", fail_replace)
+    cache.store(req, b"new", '"v2"')
+    assert cache.load(req) == b"old"
+    assert cache.load_etag(req) == '"v1"'
+    assert sorted(path.suffix for path in cache.directory.iterdir()) == [".bin", ".etag"]
+
+
+def test_response_cache_store_ignores_write_errors(tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("x", encoding="utf-8")
+    cache = mod.ResponseCache(blocker / "sub", 60.0)
+    req = mod.request.Request("https://example.test/b")
+    cache.store(req, b"data")
+    assert cache.load(req) is None
+
+
 def test_fetch_published_file_details_ok(monkeypatch) -> None:
     payload = json.dumps(
         {"response": {"publishedfiledetails": [{"publishedfileid": "1"}, "skip"]}}
@@ -268,6 +426,18 @@ def test_fetch_published_file_details_multibatch(monkeypatch) -> None:
     assert len(details) == 2
 
 
+def test_fetch_published_file_details_keeps_batch_order(monkeypatch) -> None:
+    def fake(req, timeout):
+        first_id = parse_qs(req.data.decode("utf-8"))["publishedfileids[0]"][0]
+        body = {"response": {"publishedfiledetails": [{"publishedfileid": first_id}]}}
+        return _FakeResp(json.dumps(body).encode("utf-8"))
+
+    monkeypatch.setattr(mod.request, "urlopen", fake)
+    details = mod.fetch_published_file_details([str(i) for i in range(350)], 1.0)
+    assert [d["publishedfileid"] for d in details] == ["0", "100", "200", "300"]
+    assert mod.fetch_published_file_details([], 1.0) == []
+
+
 def test_fetch_published_file_details_non_list(monkeypatch) -> None:
     # publishedfiledetails not a list -> extend branch skipped, loop continues.
     payload = json.dumps({"response": {"publishedfiledetails": "notlist"}}).encode("utf-8")
@@ -332,6 +502,22 @@ def test_main_live_mode(tmp_path: Path, monkeypatch, capsys) -> None:
     assert data["topMods"][0]["workshopId"] == "1"
 
 
+def test_main_live_mode_with_cache_dir(tmp_path: Path, monkeypatch) -> None:
+    seen: list[object] = []
+
+    def fake_scrape(app_id, pages, timeout, cache):
+        seen.append(cache)
+        return ["1"], []
+
+    monkeypatch.setattr(mod, "scrape_workshop_ids", fake_scrape)
+    monkeypatch.setattr(mod, "fetch_published_file_details", lambda ids, timeout, cache: [])
+    out = tmp_path / "out.json"
+    argv = ["d.py", "--output", str(out), "--cache-dir", str(tmp_path / "c"), "--cache-ttl", "5"]
+    monkeypatch.setattr("sys.argv", argv)
+    assert mod.main() == 0
+    assert seen == [mod.ResponseCache(tmp_path / "c", 5.0)]
+
+
 def test_main_live_mode_no_ids(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setattr(mod, "scrape_workshop_ids", lambda *a: ([], []))
     monkeypatch.setattr("sys.argv", ["d.py", "--output", str(tmp_path / "o.json")])
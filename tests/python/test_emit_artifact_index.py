@@ -96,6 +96,15 @@ def test_resolve_hash_missing_and_present(tmp_path: Path) -> None:
     assert mod._resolve_hash(f) is not None
 
 
+def test_resolve_hashes_keeps_keys(tmp_path: Path) -> None:
+    import hashlib
+
+    f = _write(tmp_path / "f.bin", "abc")
+    out = mod._resolve_hashes({"a": f, "b": None, "c": tmp_path / "no.bin"})
+    assert out == {"a": hashlib.sha256(b"abc").hexdigest(), "b": None, "c": None}
+    assert list(out) == ["a", "b", "c"]
+
+
 def test_main_without_decompile_archive(tmp_path: Path, monkeypatch, capsys) -> None:
     binary = _write(tmp_path / "bin.exe", "binary")
     raw = _write(tmp_path / "raw.json", "{}")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 from pathlib import Path
 
@@ -28,6 +30,26 @@ def test_load_raw_symbols_filters_incomplete(tmp_path: Path) -> None:
     out = mod._load_raw_symbols(raw)
     assert [s.name for s in out] == ["a", "c"]
     assert out[1].kind == "unknown"
+    assert mod._load_raw_symbols(raw, reverse=True) == out[::-1]
+
+
+def test_sha256_reuses_digest_until_file_changes(tmp_path: Path, monkeypatch) -> None:
+    binary = tmp_path / "game.exe"
+    binary.write_bytes(b"abc")
+    calls: list[str] = []
+    real_digest = mod.hashlib.file_digest
+
+    def _counting_digest(handle, name):
+        calls.append(name)
+        return real_digest(handle, name)
+
+    monkeypatch.setattr(mod.hashlib, "file_digest", _counting_digest)
+    assert mod._sha256(binary) == hashlib.sha256(b"abc").hexdigest()
+    assert mod._sha256(binary) == hashlib.sha256(b"abc").hexdigest()
+    assert len(calls) == 1
+    binary.write_bytes(b"abcd")
+    assert mod._sha256(binary) == hashlib.sha256(b"abcd").hexdigest()
+    assert len(calls) == 2
 
 
 def test_parse_address_variants() -> None:
@@ -46,6 +68,8 @@ def test_normalized_address() -> None:
 def test_normalize_anchor_id() -> None:
     assert mod._normalize_anchor_id("Set Credits!") == "set_credits"
     assert mod._normalize_anchor_id("___") == ""
+    assert mod._normalize_anchor_id("__Fog--Reveal__Toggle2_") == "fog_reveal_toggle2"
+    assert mod._normalize_anchor_id("ΟΔΟΣ Café") == "οδοσ_café"
 
 
 def test_fingerprint_id() -> None:
@@ -156,3 +180,21 @@ def test_main_without_decompile_archive(tmp_path: Path, monkeypatch) -> None:
     summary_data = json.loads(summary.read_text(encoding="utf-8"))
     assert summary_data["toolVersions"]["ghidra"] == "unknown"
     assert summary_data["artifactPointers"]["decompileArchivePath"] == ""
+
+
+def test_run_accepts_parsed_namespace(tmp_path: Path) -> None:
+    raw = _raw(tmp_path / "r.json", [{"name": "credits_value", "address": "0x10"}])
+    binary = tmp_path / "bin.exe"
+    binary.write_text("b", encoding="utf-8")
+    args = argparse.Namespace(
+        raw_symbols=str(raw),
+        binary_path=str(binary),
+        analysis_run_id="rid",
+        output_pack=str(tmp_path / "out" / "pack.json"),
+        output_summary=str(tmp_path / "out" / "summary.json"),
+        symbol_order="input",
+        decompile_archive_path="",
+    )
+    assert mod.run(args) == 0
+    pack_data = json.loads((tmp_path / "out" / "pack.json").read_text(encoding="utf-8"))
+    assert [a["id"] for a in pack_data["anchors"]] == ["credits_value"]
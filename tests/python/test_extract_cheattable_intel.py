@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import json
+from dataclasses import asdict
 from pathlib import Path
-from xml.etree.ElementTree import fromstring
+from xml.etree.ElementTree import ParseError, fromstring
 
 import pytest
-from conftest import load_script_module
+from conftest import InProcessPoolExecutor, load_script_module
 
 mod = load_script_module("tools/extract-cheattable-intel.py", "extract_cheattable_intel")
 
@@ -51,9 +52,13 @@ def test_mapping_from_description() -> None:
     assert mod.mapping_from_description("random") == "unmapped"
 
 
-def test_parse_restore_bytes() -> None:
-    script = "[ENABLE]\ndb 90 90\n[DISABLE]\ndb 8B 45 FC\nmov eax,1\n"
-    assert mod.parse_restore_bytes(script) == ["8B 45 FC"]
+def test_extract_intel_restore_bytes() -> None:
+    script = (
+        "[ENABLE]\r\ndb 90 90\r\n  [disable]  \r\n  db 8B  45 FC \r\nDB 90\r\ndb 8b\r\n"
+        "mov eax,1\r\n[ENABLE]\r\ndb 74 0A\r\n"
+    )
+    intel = mod.extract_intel_from_script("g", "x", script)
+    assert intel.disable_restore_bytes == ["8B 45 FC"]
 
 
 def test_extract_intel_from_script_full() -> None:
@@ -70,6 +75,13 @@ def test_extract_intel_from_script_full() -> None:
     assert intel.disable_restore_bytes == ["90"]
 
 
+def test_extract_intel_from_script_nop_line() -> None:
+    script = "aobscanmodule(sym,game.exe,74 0A)\n  NOP  \n"
+    intel = mod.extract_intel_from_script("grp", "Unlimited Build", script)
+    assert intel.technique == "branch_bypass_patch"
+    assert intel.constant_writes == []
+
+
 def test_extract_intel_no_scan_adds_note() -> None:
     intel = mod.extract_intel_from_script("g", "Some Donate paypal entry", "mov eax,1\n")
     assert any("No aobscanmodule" in n for n in intel.notes)
@@ -108,7 +120,9 @@ def test_iter_cheat_entries_group_without_nested() -> None:
 def test_dedupe_intel() -> None:
     a = mod.ScriptIntel(group="g", description="Same", technique="direct_patch")
     b = mod.ScriptIntel(group="g", description="same", technique="direct_patch")
-    assert len(mod.dedupe_intel([a, b])) == 1
+    c = mod.ScriptIntel(group="h", description="Same", technique="direct_patch")
+    assert mod.dedupe_intel([a, b, c, a]) == [a, c]
+    assert mod.dedupe_intel([a, b])[0] is a
 
 
 def test_should_skip_entry() -> None:
@@ -134,6 +148,47 @@ def test_collect_script_intel() -> None:
     assert records[0].description == "Infinite Credits"
 
 
+def test_intel_to_dict_matches_asdict() -> None:
+    intel = mod.ScriptIntel(
+        group="grp",
+        description="Infinite Credits",
+        technique="code_cave_override",
+        aob_scans=[mod.AobScan("s", "m", "90 90")],
+        injection_points=["0x1"],
+        constant_writes=[mod.ConstantWrite("addr", "int", "5")],
+        disable_restore_bytes=["90"],
+        notes=["a note"],
+    )
+    view = mod.intel_to_dict(intel)
+    assert view == asdict(intel)
+    assert list(view) == list(asdict(intel))
+
+
+def test_collect_entry_intel_parallel_matches_serial(monkeypatch) -> None:
+    entries = "".join(
+        f"""<CheatEntry><Description>"Entry {i}"</Description>
+          <VariableType>Auto Assembler Script</VariableType>
+          <AssemblerScript>aobscanmodule(s{i},m,90 {i:02X})</AssemblerScript>
+        </CheatEntry>"""
+        for i in range(6)
+    )
+    root = fromstring(f"<CheatTable><CheatEntries>{entries}</CheatEntries></CheatTable>")
+    serial = mod.collect_entry_intel(mod.iter_cheat_entries(root), jobs=0)
+    monkeypatch.setattr(mod, "PARALLEL_ENTRY_THRESHOLD", 2)
+    monkeypatch.setattr(mod, "PARALLEL_CHUNK_SIZE", 2)
+    pools: list[InProcessPoolExecutor] = []
+
+    def make_pool(max_workers=None):
+        pools.append(InProcessPoolExecutor(max_workers=max_workers))
+        return pools[-1]
+
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", make_pool)
+    parallel = mod.collect_entry_intel(mod.iter_cheat_entries(root), jobs=2)
+    assert [pool.max_workers for pool in pools] == [2]
+    assert parallel == serial
+    assert [r.description for r in parallel] == [f"Entry {i}" for i in range(6)]
+
+
 def test_render_markdown_full() -> None:
     intel = mod.ScriptIntel(
         group="grp",
@@ -187,6 +242,14 @@ def test_main_ok(tmp_path: Path, monkeypatch, capsys) -> None:
     assert "Wrote 1 extracted entries" in capsys.readouterr().out
 
 
+def test_parse_args_rejects_negative_jobs(monkeypatch, capsys) -> None:
+    monkeypatch.setattr("sys.argv", ["e.py", "--jobs", "-1"])
+    with pytest.raises(SystemExit) as excinfo:
+        mod.parse_args()
+    assert excinfo.value.code == 2
+    assert "--jobs must be zero or greater" in capsys.readouterr().err
+
+
 def test_main_missing_ct(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setattr("sys.argv", ["e.py", "--ct", str(tmp_path / "nope.CT")])
     with pytest.raises(FileNotFoundError, match="Cheat table not found"):
@@ -195,13 +258,27 @@ def test_main_missing_ct(tmp_path: Path, monkeypatch) -> None:
 
 def test_main_no_root(tmp_path: Path, monkeypatch) -> None:
     ct = tmp_path / "empty.CT"
-    ct.write_text("<CheatTable/>", encoding="utf-8")
+    ct.write_text("", encoding="utf-8")
     monkeypatch.setattr("sys.argv", ["e.py", "--ct", str(ct)])
+    with pytest.raises(ParseError, match="no element found"):
+        mod.main()
 
-    class _NoRootTree:
-        def getroot(self):
-            return None
 
-    monkeypatch.setattr(mod.element_tree, "parse", lambda _p: _NoRootTree())
-    with pytest.raises(ValueError, match="no root element"):
-        mod.main()
+def test_stream_cheat_entries_matches_tree_walk(tmp_path: Path) -> None:
+    xml = """<CheatTable><Files/><CheatEntries>
+      <CheatEntry><Description>"Group A"</Description><GroupHeader>1</GroupHeader>
+        <CheatEntries>
+          <CheatEntry><Description>"Child"</Description></CheatEntry>
+        </CheatEntries>
+      </CheatEntry>
+      <CheatEntry><Description>"Empty Group"</Description><GroupHeader>1</GroupHeader></CheatEntry>
+      <Comment/>
+      <CheatEntry><Description>"Flat"</Description></CheatEntry>
+    </CheatEntries>
+    <CheatEntries><CheatEntry><Description>"Ignored"</Description></CheatEntry></CheatEntries>
+    </CheatTable>"""
+    ct = tmp_path / "table.CT"
+    ct.write_text(xml, encoding="utf-8")
+    expected = [(g, e.findtext("Description")) for g, e in mod.iter_cheat_entries(fromstring(xml))]
+    streamed = [(g, e.findtext("Description")) for g, e in mod.stream_cheat_entries(ct)]
+    assert streamed == expected == [("Group A", '"Child"'), ("", '"Flat"')]
@@ -10,10 +10,10 @@ from conftest import load_script_module
 mod = load_script_module("tools/generate-synthetic-save.py", "generate_synthetic_save")
 
 
-def test_write_i32_and_i64() -> None:
+def test_i32_and_i64_structs() -> None:
     buf = bytearray(32)
-    mod.write_i32(buf, 0, 7)
-    mod.write_i64(buf, 8, 12345)
+    mod._I32.pack_into(buf, 0, 7)
+    mod._I64.pack_into(buf, 8, 12345)
     assert struct.unpack_from("<i", buf, 0)[0] == 7
     assert struct.unpack_from("<q", buf, 8)[0] == 12345
 
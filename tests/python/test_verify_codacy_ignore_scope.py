@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+import os
+import re
 from pathlib import Path
 
 from conftest import load_script_module
@@ -79,19 +81,81 @@ def test_list_repository_files(tmp_path: Path) -> None:
     assert "obj/gen.cs" not in files
 
 
+def test_list_repository_files_prunes_and_sorts(tmp_path: Path) -> None:
+    for relative in ("z.txt", "src/scratch/keep.cs", "scratch/drop.cs", "src/bin/drop.dll"):
+        (tmp_path / relative).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative).write_text("x", encoding="utf-8")
+    (tmp_path / "link").symlink_to(tmp_path / "src", target_is_directory=True)
+    files = mod.list_repository_files(tmp_path)
+    assert files == ["src/scratch/keep.cs", "z.txt"]
+    assert mod.list_repository_files(tmp_path / "missing") == []
+
+
 def test_match_ignored_files() -> None:
     ignored, counts = mod.match_ignored_files(["TestResults/x.txt", "src/a.cs"], ["TestResults/**"])
     assert ignored == ["TestResults/x.txt"]
     assert counts == {"TestResults/**": 1}
 
 
+def test_match_ignored_files_counts_every_pattern() -> None:
+    files = ["artifacts/a.md", "docs/b.md", "src/c.cs"]
+    patterns = ["artifacts\\**", "**/*.md", "*.cs"]
+    ignored, counts = mod.match_ignored_files(files, patterns)
+    assert ignored == files
+    assert counts == {"artifacts\\**": 1, "**/*.md": 2, "*.cs": 1}
+    assert mod.compile_pattern_matchers("*.cs") is mod.compile_pattern_matchers("*.cs")
+
+
+def test_literal_directory_prefix() -> None:
+    assert mod.literal_directory_prefix("(new)codex(plans)/**") == "(new)codex(plans)/"
+    assert mod.literal_directory_prefix("a\\b/**") == "a/b/"
+    assert mod.literal_directory_prefix("a*/**") is None
+    assert mod.literal_directory_prefix("**/*.md") is None
+
+
+def test_match_ignored_files_mixes_prefix_and_glob_patterns() -> None:
+    files = ["docs/a.md", "docs/b.txt", "src/c.md", "src/d.cs"]
+    ignored, counts = mod.match_ignored_files(files, ["**/*.md", "docs/**"])
+    assert ignored == ["docs/a.md", "docs/b.txt", "src/c.md"]
+    assert list(counts.items()) == [("**/*.md", 2), ("docs/**", 2)]
+    assert mod.match_ignored_files(["docs/a"], ["docs/**", "docs/**"]) == (
+        ["docs/a"],
+        {"docs/**": 2},
+    )
+
+
+def test_pattern_flags_follow_normcase() -> None:
+    folds_case = os.path.normcase("A") == "a"
+    assert bool(mod.PATTERN_FLAGS & re.IGNORECASE) is folds_case
+
+
+def test_match_ignored_files_folds_case_like_windows_fnmatch(monkeypatch) -> None:
+    monkeypatch.setattr(mod, "PATTERN_FLAGS", re.IGNORECASE)
+    mod.compile_pattern_matchers.cache_clear()
+    mod.compile_combined_matchers.cache_clear()
+    files = ["Docs/A.MD", "TESTRESULTS/x.txt", "src/c.cs"]
+    patterns = ["**/*.md", "testresults/**", "SRC/*.CS"]
+    try:
+        ignored, counts = mod.match_ignored_files(files, patterns)
+    finally:
+        mod.compile_pattern_matchers.cache_clear()
+        mod.compile_combined_matchers.cache_clear()
+    assert ignored == files
+    assert counts == {"**/*.md": 1, "testresults/**": 1, "SRC/*.CS": 1}
+
+
+def test_match_ignored_files_without_patterns() -> None:
+    assert mod.match_ignored_files(["src/a.cs"], []) == ([], {})
+
+
 def test_build_report(tmp_path: Path) -> None:
     (tmp_path / "TestResults").mkdir()
     (tmp_path / "TestResults" / "r.txt").write_text("x", encoding="utf-8")
     (tmp_path / "src").mkdir()
     (tmp_path / "src" / "a.cs").write_text("x", encoding="utf-8")
-    report = mod.build_report(tmp_path, Path(".codacy.yml"), ["TestResults/**"])
+    report, ignored = mod.build_report(tmp_path, Path(".codacy.yml"), ["TestResults/**"])
     assert report["ignoredTrackedFilesTotal"] == 1
+    assert ignored == ["TestResults/r.txt"]
     assert report["trackedFilesTotal"] == 2
 
 
@@ -13,63 +13,124 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import glob
+import functools
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 SCHEMA_VERSION = "1.0"
+PROFILE_READ_WORKERS = 8
+# Batches at least this large are fanned out across worker processes.
+PARALLEL_CASE_THRESHOLD = 256
+PARALLEL_CHUNK_SIZE = 64
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProfileInfo:
     profile_id: str
     exe_target: str
     steam_workshop_id: Optional[str]
     metadata: Dict[str, str]
+    # Derived once per profile: recommendation consults these for every case.
+    profile_id_lower: str = field(init=False, repr=False, compare=False)
+    sort_bucket: int = field(init=False, repr=False, compare=False)
+    csv_cache: Dict[str, Tuple[str, ...]] = field(init=False, repr=False, compare=False)
+    hints: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    required_ids: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "profile_id_lower", self.profile_id.lower())
+        object.__setattr__(self, "sort_bucket", _sort_bucket(self.profile_id_lower))
+        object.__setattr__(
+            self, "csv_cache", {key: tuple(parse_csv(self.metadata, key)) for key in self.metadata}
+        )
+        object.__setattr__(self, "hints", tuple(gather_hints(self)))
+        object.__setattr__(self, "required_ids", tuple(required_workshop_ids(self)))
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileIndex:
+    """Lookup tables built once per profile catalog and shared across cases."""
+
+    # workshop id -> catalog keys of the profiles that reference it (primary or required).
+    workshop: Dict[str, Tuple[str, ...]]
+    # Distinct modpath hints, longest first, each with the catalog keys declaring it.
+    hints: Tuple[Tuple[str, Tuple[str, ...]], ...]
 
 
-EXE_HINT_MATCHERS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
-    ("sweaw", ("sweaw", "sweaw.exe")),
-    ("swfoc", ("swfoc", "swfoc.exe")),
-    ("starwarsg", ("starwarsg", "starwarsg.exe")),
-)
+# Checked in priority order; "<hint>.exe" always contains "<hint>", so the bare token suffices.
+EXE_HINTS: Tuple[str, ...] = ("sweaw", "swfoc", "starwarsg")
+
+# Applied to the lowercased command line, so no case folding is needed in the engine.
+_STEAMMOD_RE = re.compile(r"steammod\s*=\s*(\d+)")
+# MODPATH values keep their original case: the value pattern runs on the raw command
+# line right after a "modpath" keyword located in the lowercased copy.
+_MODPATH_VALUE_RE = re.compile(r'\s*=\s*(?:"([^"]+)"|([^\s]+))')
+_MODPATH_RE = re.compile("modpath" + _MODPATH_VALUE_RE.pattern, re.IGNORECASE)
+_SLASH_RUN_RE = re.compile(r"/{2,}")
+
+# Built once: json.dump/json.dumps construct a fresh encoder whenever options are passed.
+_PRETTY_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=True)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=True)
 
 
 def normalize_token(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
     out = value.strip().strip('"').replace("\\", "/")
-    while "//" in out:
-        out = out.replace("//", "/")
-    return out.lower()
+    return _SLASH_RUN_RE.sub("/", out).lower()
 
 
-def parse_steammod_ids(command_line: Optional[str]) -> List[str]:
+def parse_steammod_ids(
+    command_line: Optional[str], command_line_lower: Optional[str] = None
+) -> List[str]:
     if not command_line:
         return []
-    ids = set(re.findall(r"steammod\s*=\s*(\d+)", command_line, flags=re.IGNORECASE))
-    return sorted(ids)
+    lowered = command_line.lower() if command_line_lower is None else command_line_lower
+    # A substring probe is far cheaper than running the regex on lines without the token.
+    if "steammod" not in lowered:
+        return []
+    return sorted(dict.fromkeys(_STEAMMOD_RE.findall(lowered)))
 
 
 def parse_forced_workshop_ids(raw: Optional[str]) -> List[str]:
     if not raw:
         return []
-    ids: Set[str] = set()
-    for token in raw.split(","):
-        value = token.strip()
-        if value:
-            ids.add(value)
-    return sorted(ids)
+    return sorted(dict.fromkeys(value for value in (t.strip() for t in raw.split(",")) if value))
+
+
+def _match_after_keyword(
+    pattern: re.Pattern[str], text: str, lowered: str, keyword: str
+) -> Optional[re.Match[str]]:
+    """Try ``pattern`` anchored right after each ``keyword`` instead of at every offset."""
+    start = lowered.find(keyword)
+    while start != -1:
+        match = pattern.match(text, start + len(keyword))
+        if match:
+            return match
+        start = lowered.find(keyword, start + 1)
+    return None
 
 
-def parse_modpath(command_line: Optional[str]) -> Optional[str]:
+def parse_modpath(
+    command_line: Optional[str], command_line_lower: Optional[str] = None
+) -> Optional[str]:
     if not command_line:
         return None
-    match = re.search(r'modpath\s*=\s*(?:"([^"]+)"|([^\s]+))', command_line, flags=re.IGNORECASE)
+    lowered = command_line.lower() if command_line_lower is None else command_line_lower
+    if "modpath" not in lowered:
+        return None
+    if len(lowered) == len(command_line):
+        match = _match_after_keyword(_MODPATH_VALUE_RE, command_line, lowered, "modpath")
+    else:
+        # str.lower() changes the length of a few non-ASCII characters, which would
+        # misalign offsets taken from the lowered copy.
+        match = _MODPATH_RE.search(command_line)
     if not match:
         return None
     value = match.group(1) or match.group(2)
@@ -110,10 +171,22 @@ def load_profiles(profile_root: Path) -> Dict[str, ProfileInfo]:  # NOSONAR
                     ids.add(profile_id)
             manifest_profile_ids = ids
 
+    # Same selection and order as sorted(glob("*.json")): glob skips dotfiles
+    # and, through normcase, matches "*.JSON" on Windows.
+    with os.scandir(profiles_dir) as entries:
+        names = sorted(
+            entry.name
+            for entry in entries
+            if os.path.normcase(entry.name).endswith(".json")
+            and not entry.name.startswith(".")
+            and entry.is_file()
+        )
+    with ThreadPoolExecutor(max_workers=PROFILE_READ_WORKERS) as pool:
+        raw_profiles = list(pool.map(Path.read_bytes, [profiles_dir / name for name in names]))
+
     out: Dict[str, ProfileInfo] = {}
-    for json_file in sorted(glob.glob(str(profiles_dir / "*.json"))):
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    for raw in raw_profiles:
+        data = json.loads(raw)
         profile_id = str(data.get("id", "")).strip()
         if not profile_id:
             continue
@@ -139,89 +212,80 @@ def infer_launch_kind(steam_ids: List[str], modpath_norm: Optional[str], exe_hin
         return "Workshop"
     if modpath_norm:
         return "LocalModPath"
-    if exe_hint in {"sweaw", "swfoc", "starwarsg"}:
+    if exe_hint in EXE_HINTS:
         return "BaseGame"
     return "Unknown"
 
 
-def _text_or_empty(value: Optional[str]) -> str:
-    return (value or "").lower()
-
-
-def _contains_any_token(haystack: str, needles: Tuple[str, ...]) -> bool:
-    return any(needle in haystack for needle in needles)
-
-
-def _matches_exe_hint(fields: Tuple[str, str, str], needles: Tuple[str, ...]) -> bool:
-    return any(_contains_any_token(field, needles) for field in fields)
-
-
+# Batch fixtures repeat the same process fields across many cases.
+@functools.lru_cache(maxsize=1024)
 def detect_exe_hint(
     process_name: Optional[str],
     process_path: Optional[str],
     command_line: Optional[str],
+    command_line_lower: Optional[str] = None,
 ) -> str:
-    fields = (
-        _text_or_empty(process_name),
-        _text_or_empty(process_path),
-        _text_or_empty(command_line),
-    )
-    for exe_hint, needles in EXE_HINT_MATCHERS:
-        if _matches_exe_hint(fields, needles):
+    name = (process_name or "").lower()
+    path = (process_path or "").lower()
+    cmd = (command_line or "").lower() if command_line_lower is None else command_line_lower
+    for exe_hint in EXE_HINTS:
+        if exe_hint in name or exe_hint in path or exe_hint in cmd:
             return exe_hint
     return "unknown"
 
 
 def gather_hints(profile: ProfileInfo) -> List[str]:
     hints: Set[str] = set()
-    hints.add(profile.profile_id.lower())
+    hints.add(profile.profile_id_lower)
     if profile.steam_workshop_id:
         hints.add(profile.steam_workshop_id)
     for key in ("localPathHints", "profileAliases"):
-        for value in parse_csv(profile.metadata, key):
+        for value in profile.csv_cache.get(key, ()):
             norm = normalize_token(value)
             if norm:
                 hints.add(norm)
     return sorted(hints)
 
 
+# Reason-code suffix per sort bucket (0=roe, 1=aotr, 2=other).
+_REASON_SUFFIX_BY_BUCKET = ("roe", "aotr", "profile")
+_REASON_PREFIX_BY_SOURCE = {"steam": "steammod_exact_", "modpath": "modpath_hint_"}
+
+
+def _reason_code(sort_bucket: int, source: str) -> str:
+    prefix = _REASON_PREFIX_BY_SOURCE.get(source)
+    if prefix is None:
+        return "unknown"
+    return prefix + _REASON_SUFFIX_BY_BUCKET[sort_bucket]
+
+
 def reason_code_for_profile(profile_id: str, source: str) -> str:
-    pid = profile_id.lower()
-    if source == "steam":
-        if "roe_" in pid:
-            return "steammod_exact_roe"
-        if "aotr_" in pid:
-            return "steammod_exact_aotr"
-        return "steammod_exact_profile"
-    if source == "modpath":
-        if "roe_" in pid:
-            return "modpath_hint_roe"
-        if "aotr_" in pid:
-            return "modpath_hint_aotr"
-        return "modpath_hint_profile"
-    return "unknown"
+    return _reason_code(profile_sort_priority(profile_id), source)
 
 
 def profile_priority_key(profile: ProfileInfo) -> Tuple[int, str]:
-    return (profile_sort_priority(profile.profile_id), profile.profile_id)
+    return (profile.sort_bucket, profile.profile_id)
 
 
-def profile_sort_priority(profile_id: str) -> int:
-    pid = profile_id.lower()
-    if "roe_" in pid:
+def _sort_bucket(pid_lower: str) -> int:
+    if "roe_" in pid_lower:
         return 0
-    if "aotr_" in pid:
+    if "aotr_" in pid_lower:
         return 1
     return 2
 
 
+def profile_sort_priority(profile_id: str) -> int:
+    return _sort_bucket(profile_id.lower())
+
+
 def required_workshop_ids(profile: ProfileInfo) -> List[str]:
     ids: List[str] = []
     if profile.steam_workshop_id:
         ids.append(profile.steam_workshop_id)
-    ids.extend(parse_csv(profile.metadata, "requiredWorkshopIds"))
-    ids.extend(parse_csv(profile.metadata, "requiredWorkshopId"))
-    return sorted(set(ids))
+    ids.extend(profile.csv_cache.get("requiredWorkshopIds", ()))
+    ids.extend(profile.csv_cache.get("requiredWorkshopId", ()))
+    return sorted(dict.fromkeys(ids))
 
 
 def score_workshop_match(profile: ProfileInfo, steam_ids: Set[str]) -> int:
@@ -229,7 +293,7 @@ def score_workshop_match(profile: ProfileInfo, steam_ids: Set[str]) -> int:
     if profile.steam_workshop_id and profile.steam_workshop_id in steam_ids:
         score = max(score, 1000)
 
-    required_ids = required_workshop_ids(profile)
+    required_ids = profile.required_ids
     if not required_ids:
         return score
 
@@ -241,21 +305,46 @@ def score_workshop_match(profile: ProfileInfo, steam_ids: Set[str]) -> int:
     return score
 
 
+def build_profile_index(profiles: Dict[str, ProfileInfo]) -> ProfileIndex:
+    workshop: Dict[str, List[str]] = {}
+    hints: Dict[str, List[str]] = {}
+    for key, profile in profiles.items():
+        for workshop_id in profile.required_ids:
+            workshop.setdefault(workshop_id, []).append(key)
+        for hint in profile.hints:
+            if hint:
+                hints.setdefault(hint, []).append(key)
+    return ProfileIndex(
+        workshop={wid: tuple(keys) for wid, keys in workshop.items()},
+        hints=tuple(
+            (hint, tuple(keys))
+            for hint, keys in sorted(hints.items(), key=lambda item: (-len(item[0]), item[0]))
+        ),
+    )
+
+
 def steam_profile_match(
-    profiles: Dict[str, ProfileInfo], steam_ids: List[str]
+    profiles: Dict[str, ProfileInfo],
+    steam_ids: Set[str],
+    index: Optional[ProfileIndex] = None,
 ) -> Optional[ProfileInfo]:
     if not steam_ids:
         return None
 
-    steam_set = set(steam_ids)
+    if index is None:
+        index = build_profile_index(profiles)
+    # Only profiles referencing one of the launch ids can score above zero.
+    candidate_keys: Dict[str, None] = {}
+    for steam_id in steam_ids:
+        candidate_keys.update(dict.fromkeys(index.workshop.get(steam_id, ())))
+
     best_profile: Optional[ProfileInfo] = None
     best_score = 0
     best_required_count = -1
-    for profile in profiles.values():
-        score = score_workshop_match(profile, steam_set)
-        if score <= 0:
-            continue
-        required_count = len(required_workshop_ids(profile))
+    for key in candidate_keys:
+        profile = profiles[key]
+        score = score_workshop_match(profile, steam_ids)
+        required_count = len(profile.required_ids)
         if (
             best_profile is None
             or score > best_score
@@ -274,23 +363,27 @@ def steam_profile_match(
 
 
 def best_modpath_match(
-    profiles: Dict[str, ProfileInfo], modpath_norm: str
+    profiles: Dict[str, ProfileInfo],
+    modpath_norm: str,
+    index: Optional[ProfileIndex] = None,
 ) -> Optional[ProfileInfo]:
-    hint_matches: List[Tuple[int, ProfileInfo]] = []
-    for profile in profiles.values():
-        hints = gather_hints(profile)
-        score = 0
-        for hint in hints:
-            if hint and hint in modpath_norm:
-                score = max(score, len(hint))
-        if score > 0:
-            hint_matches.append((score, profile))
-
-    if not hint_matches:
+    if index is None:
+        index = build_profile_index(profiles)
+    # A profile scores the length of its longest hint found in the modpath, so scanning
+    # hints longest-first lets us stop after the first length that produces a match.
+    best_len = 0
+    candidate_keys: Dict[str, None] = {}
+    for hint, keys in index.hints:
+        if len(hint) < best_len:
+            break
+        if hint in modpath_norm:
+            best_len = len(hint)
+            candidate_keys.update(dict.fromkeys(keys))
+
+    if not candidate_keys:
         return None
 
-    hint_matches.sort(key=lambda pair: (-pair[0],) + profile_priority_key(pair[1]))
-    return hint_matches[0][1]
+    return min((profiles[key] for key in candidate_keys), key=profile_priority_key)
 
 
 def fallback_profile_for_exe(
@@ -318,29 +411,31 @@ def recommend_profile(
     steam_ids: List[str],
     modpath_norm: Optional[str],
     exe_hint: str,
+    index: Optional[ProfileIndex] = None,
 ) -> Dict[str, Any]:
     # 1) Exact workshop-id match.
-    best_steam_match = steam_profile_match(profiles, steam_ids)
+    steam_set = set(steam_ids)
+    best_steam_match = steam_profile_match(profiles, steam_set, index)
     if best_steam_match:
         confidence = (
             1.0
             if best_steam_match.steam_workshop_id
-            and best_steam_match.steam_workshop_id in set(steam_ids)
+            and best_steam_match.steam_workshop_id in steam_set
             else 0.97
         )
         return {
             "profileId": best_steam_match.profile_id,
-            "reasonCode": reason_code_for_profile(best_steam_match.profile_id, "steam"),
+            "reasonCode": _reason_code(best_steam_match.sort_bucket, "steam"),
             "confidence": confidence,
         }
 
     # 2) MODPATH hint match from profile metadata.
     if modpath_norm:
-        best = best_modpath_match(profiles, modpath_norm)
+        best = best_modpath_match(profiles, modpath_norm, index)
         if best:
             return {
                 "profileId": best.profile_id,
-                "reasonCode": reason_code_for_profile(best.profile_id, "modpath"),
+                "reasonCode": _reason_code(best.sort_bucket, "modpath"),
                 "confidence": 0.95,
             }
 
@@ -368,21 +463,14 @@ def dependency_hints(profiles: Dict[str, ProfileInfo], profile_id: Optional[str]
         }
 
     profile = profiles[profile_id]
-    required_ids: List[str] = []
-    if profile.steam_workshop_id:
-        required_ids.append(profile.steam_workshop_id)
-    required_ids.extend(parse_csv(profile.metadata, "requiredWorkshopIds"))
-    required_ids.extend(parse_csv(profile.metadata, "requiredWorkshopId"))
-
-    required_ids = sorted(set(required_ids))
-
+    csv = profile.csv_cache
     return {
-        "requiredWorkshopIds": required_ids,
+        "requiredWorkshopIds": list(profile.required_ids),
         "requiredMarkerFile": profile.metadata.get("requiredMarkerFile"),
-        "dependencySensitiveActions": parse_csv(profile.metadata, "dependencySensitiveActions"),
-        "localPathHints": parse_csv(profile.metadata, "localPathHints"),
-        "localParentPathHints": parse_csv(profile.metadata, "localParentPathHints"),
-        "profileAliases": parse_csv(profile.metadata, "profileAliases"),
+        "dependencySensitiveActions": list(csv.get("dependencySensitiveActions", ())),
+        "localPathHints": list(csv.get("localPathHints", ())),
+        "localParentPathHints": list(csv.get("localParentPathHints", ())),
+        "profileAliases": list(csv.get("profileAliases", ())),
     }
 
 
@@ -391,6 +479,8 @@ def detect_one(  # NOSONAR
     profiles: Dict[str, ProfileInfo],
     forced_workshop_ids: Optional[List[str]] = None,
     forced_profile_id: Optional[str] = None,
+    index: Optional[ProfileIndex] = None,
+    generated_at: Optional[str] = None,
 ) -> Dict[str, Any]:
     case_name = process_input.get("name")
     case_name = str(case_name) if case_name is not None else None
@@ -399,14 +489,15 @@ def detect_one(  # NOSONAR
     command_line = process_input.get("commandLine")
     command_line = str(command_line) if command_line is not None else None
 
-    steam_ids = parse_steammod_ids(command_line)
-    forced_ids = sorted(set(forced_workshop_ids or []))
+    command_line_lower = command_line.lower() if command_line else None
+    steam_ids = parse_steammod_ids(command_line, command_line_lower)
+    forced_ids = sorted(dict.fromkeys(forced_workshop_ids or []))
     forced_profile = (
         forced_profile_id.strip() if forced_profile_id and forced_profile_id.strip() else None
     )
-    modpath_raw = parse_modpath(command_line)
+    modpath_raw = parse_modpath(command_line, command_line_lower)
     modpath_norm = normalize_token(modpath_raw)
-    exe_hint = detect_exe_hint(process_name, process_path, command_line)
+    exe_hint = detect_exe_hint(process_name, process_path, command_line, command_line_lower or "")
     source = "detected"
     if not steam_ids and not modpath_norm and (forced_ids or forced_profile):
         source = "forced"
@@ -421,7 +512,7 @@ def detect_one(  # NOSONAR
             "confidence": 1.0,
         }
     else:
-        recommendation = recommend_profile(profiles, steam_ids, modpath_norm, exe_hint)
+        recommendation = recommend_profile(profiles, steam_ids, modpath_norm, exe_hint, index)
 
     launch_context = {
         "launchKind": launch_kind,
@@ -437,7 +528,7 @@ def detect_one(  # NOSONAR
 
     return {
         "schemaVersion": SCHEMA_VERSION,
-        "generatedAtUtc": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "generatedAtUtc": generated_at or dt.datetime.now(dt.timezone.utc).isoformat(),
         "input": {
             "name": case_name,
             "processName": process_name,
@@ -488,25 +579,50 @@ def _load_cases_payload(input_path: str) -> Optional[Dict[str, Any]]:
     return payload
 
 
+# Per-process detector installed by the pool initializer.
+_WORKER_STATE: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+
+def _init_case_worker(detect: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+    _WORKER_STATE["detect"] = detect
+
+
+def _detect_in_worker(case: Dict[str, Any]) -> Dict[str, Any]:
+    return _WORKER_STATE["detect"](case)
+
+
 def _build_multi_case_output(
     payload: Dict[str, Any],
     profiles: Dict[str, ProfileInfo],
     forced_workshop_ids: List[str],
     forced_profile_id: Optional[str],
 ) -> Dict[str, Any]:
-    cases = payload.get("cases", [])
-    results = [
-        detect_one(
-            case if isinstance(case, dict) else {},
-            profiles,
-            forced_workshop_ids=forced_workshop_ids,
-            forced_profile_id=forced_profile_id,
+    raw_cases = payload.get("cases", [])
+    cases = [case for case in raw_cases if isinstance(case, dict)]
+    if len(cases) != len(raw_cases):
+        print(
+            f"invalid-input: skipped {len(raw_cases) - len(cases)} non-object case(s)",
+            file=sys.stderr,
         )
-        for case in cases
-    ]
+    # One timestamp for the whole batch; per-case values would differ only by microseconds.
+    generated_at = dt.datetime.now(dt.timezone.utc).isoformat()
+    detect = functools.partial(
+        detect_one,
+        profiles=profiles,
+        forced_workshop_ids=forced_workshop_ids,
+        forced_profile_id=forced_profile_id,
+        index=build_profile_index(profiles),
+        generated_at=generated_at,
+    )
+    if len(cases) < PARALLEL_CASE_THRESHOLD:
+        results = [detect(case) for case in cases]
+    else:
+        # The catalog is shipped to each worker once, not with every chunk of cases.
+        with ProcessPoolExecutor(initializer=_init_case_worker, initargs=(detect,)) as pool:
+            results = list(pool.map(_detect_in_worker, cases, chunksize=PARALLEL_CHUNK_SIZE))
     return {
         "schemaVersion": SCHEMA_VERSION,
-        "generatedAtUtc": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "generatedAtUtc": generated_at,
         "results": results,
     }
 
@@ -521,9 +637,12 @@ def _single_process_input(args: argparse.Namespace) -> Dict[str, Optional[str]]:
 
 def _emit_json(output: Any, pretty: bool) -> None:
     if pretty:
-        print(json.dumps(output, indent=2, ensure_ascii=True))
+        # Indented output only has the pure-Python encoder, so stream it into stdout.
+        sys.stdout.writelines(_PRETTY_ENCODER.iterencode(output))
     else:
-        print(json.dumps(output, separators=(",", ":"), ensure_ascii=True))
+        # One-shot encode() takes the C accelerator, which streaming iterencode() skips.
+        sys.stdout.write(_COMPACT_ENCODER.encode(output))
+    sys.stdout.write("\n")
 
 
 def main() -> int:
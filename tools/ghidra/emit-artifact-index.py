@@ -8,6 +8,7 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -21,11 +22,9 @@ def _now_iso() -> str:
 
 
 def _sha256(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    # Unbuffered handle lets file_digest fill its own buffer in C (GIL released).
+    with path.open("rb", buffering=0) as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
 
 
 def _normalize_path(path: object) -> str:
@@ -80,10 +79,21 @@ def _resolve_binary_fingerprint(symbol_pack_path: Path, binary_path: Path) -> Di
     }
 
 
-def _resolve_hash(path: Path) -> Optional[str]:
-    if not path.exists():
+def _resolve_hash(path: Optional[Path]) -> Optional[str]:
+    if path is None:
         return None
-    return _sha256(path)
+    # Opening directly answers "does it exist?" without a separate stat.
+    try:
+        return _sha256(path)
+    except FileNotFoundError:
+        return None
+
+
+def _resolve_hashes(paths: Dict[str, Optional[Path]]) -> Dict[str, Optional[str]]:
+    # file_digest releases the GIL while hashing, so threads overlap the reads.
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        digests = list(pool.map(_resolve_hash, paths.values()))
+    return dict(zip(paths, digests))
 
 
 def main() -> int:
@@ -116,14 +126,14 @@ def main() -> int:
         if decompile_archive_path
         else None,
     }
-    file_hashes = {
-        "rawSymbolsSha256": _resolve_hash(raw_symbols_path),
-        "symbolPackSha256": _resolve_hash(symbol_pack_path),
-        "analysisSummarySha256": _resolve_hash(summary_path),
-        "decompileArchiveSha256": _resolve_hash(decompile_archive_path)
-        if decompile_archive_path
-        else None,
-    }
+    file_hashes = _resolve_hashes(
+        {
+            "rawSymbolsSha256": raw_symbols_path,
+            "symbolPackSha256": symbol_pack_path,
+            "analysisSummarySha256": summary_path,
+            "decompileArchiveSha256": decompile_archive_path,
+        }
+    )
 
     payload = {
         "schemaVersion": SCHEMA_VERSION,
@@ -6,15 +6,20 @@ Normalize raw Ghidra headless symbol export into schema-backed symbol pack + sum
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
 import json
 import os
+import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 SCHEMA_VERSION = "1.0"
+# Runs of anything that is not a letter or digit collapse to one "_" separator.
+_ANCHOR_SEPARATOR_RE = re.compile(r"[\W_]+")
 
 DEFAULT_FEATURE_REQUIREMENTS: Dict[str, List[str]] = {
     "set_credits": ["credits_value"],
@@ -25,16 +30,22 @@ DEFAULT_FEATURE_REQUIREMENTS: Dict[str, List[str]] = {
     "toggle_instant_build_patch": ["instant_build_patch"],
 }
 
+# state/reasonCode pair shared by every capability row of the same outcome.
+_AVAILABLE_STATE = {"state": "Verified", "reasonCode": "CAPABILITY_PROBE_PASS"}
+_MISSING_STATE = {"state": "Unavailable", "reasonCode": "CAPABILITY_REQUIRED_MISSING"}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class RawSymbol:
     name: str
     address: str
     kind: str
 
 
-def _load_raw_symbols(path: Path) -> List[RawSymbol]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+def _load_raw_symbols(path: Path, reverse: bool = False) -> List[RawSymbol]:
+    # json.loads decodes UTF-8 bytes itself; skipping text mode avoids a
+    # separate newline-translation pass over large exports.
+    payload = json.loads(path.read_bytes())
     symbols = payload.get("symbols", [])
     results: List[RawSymbol] = []
     for entry in symbols:
@@ -44,15 +55,28 @@ def _load_raw_symbols(path: Path) -> List[RawSymbol]:
         if not name or not address:
             continue
         results.append(RawSymbol(name=name, address=address, kind=kind))
+    if reverse:
+        results.reverse()
     return results
 
 
+# check-determinism runs main() twice in one process against the same binary;
+# key on size + mtime so an unchanged file is hashed only once.
+_SHA256_CACHE: Dict[Tuple[str, int, int], str] = {}
+
+
 def _sha256(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    cached = _SHA256_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    # Unbuffered handle lets file_digest fill its own buffer in C (GIL released).
+    with path.open("rb", buffering=0) as handle:
+        digest = hashlib.file_digest(handle, "sha256").hexdigest()
+    _SHA256_CACHE[key] = digest
+    return digest
 
 
 def _fingerprint_id(module_name: str, file_sha256: str) -> str:
@@ -60,17 +84,24 @@ def _fingerprint_id(module_name: str, file_sha256: str) -> str:
     return f"{module}_{file_sha256[:16]}"
 
 
+# Pure and keyed on the name string; the determinism check re-emits the same
+# symbol names in one process, so the second run is all cache hits.
+@functools.lru_cache(maxsize=None)
 def _normalize_anchor_id(symbol_name: str) -> str:
-    normalized = "".join(ch.lower() if ch.isalnum() else "_" for ch in symbol_name)
-    return "_".join(part for part in normalized.split("_") if part)
+    collapsed = _ANCHOR_SEPARATOR_RE.sub("_", symbol_name).strip("_")
+    if collapsed.isascii():
+        return collapsed.lower()
+    # Per-character lowering keeps the historical result for context-sensitive
+    # mappings (e.g. a word-final capital sigma) that str.lower() would change.
+    return "".join(ch.lower() for ch in collapsed)
 
 
 def _parse_address(address: str) -> Optional[int]:
-    cleaned = address.strip().lower()
-    if cleaned.startswith("0x"):
+    # int(..., 16) handles hex-digit case itself; only the optional prefix needs
+    # stripping (int would otherwise also accept forms like "0x_1").
+    cleaned = address.strip()
+    if cleaned[:2] in ("0x", "0X"):
         cleaned = cleaned[2:]
-    if not cleaned:
-        return None
     try:
         return int(cleaned, 16)
     except ValueError:
@@ -90,23 +121,27 @@ def _symbol_choice_rank(symbol: RawSymbol) -> Tuple[int, int, str]:
 
 
 def _build_anchors(module_name: str, symbols: List[RawSymbol]) -> List[dict]:
-    canonical_by_anchor_id: Dict[str, RawSymbol] = {}
+    ranked: List[Tuple[str, Tuple[int, int, str], RawSymbol]] = []
     for symbol in symbols:
         anchor_id = _normalize_anchor_id(symbol.name)
-        if not anchor_id:
-            continue
+        if anchor_id:
+            ranked.append((anchor_id, _symbol_choice_rank(symbol), symbol))
 
-        current = canonical_by_anchor_id.get(anchor_id)
-        if current is None or _symbol_choice_rank(symbol) < _symbol_choice_rank(current):
-            canonical_by_anchor_id[anchor_id] = symbol
+    # One stable sort by (anchor id, rank): the first entry per id is the canonical
+    # symbol (ties keep input order) and ids come out already in emission order.
+    ranked.sort(key=itemgetter(0, 1))
+    canonical_by_anchor_id: Dict[str, Tuple[Tuple[int, int, str], RawSymbol]] = {}
+    for anchor_id, rank, symbol in ranked:
+        canonical_by_anchor_id.setdefault(anchor_id, (rank, symbol))
 
     anchors = []
-    for anchor_id in sorted(canonical_by_anchor_id.keys()):
-        symbol = canonical_by_anchor_id[anchor_id]
+    for anchor_id, (rank, symbol) in canonical_by_anchor_id.items():
+        # The rank already carries the parsed address; don't parse it again.
+        unparsed, parsed, _name = rank
         anchors.append(
             {
                 "id": anchor_id,
-                "address": _normalized_address(symbol.address),
+                "address": _normalized_address(symbol.address) if unparsed else f"0x{parsed:x}",
                 "module": module_name,
                 "confidence": 0.95,
                 "source": f"ghidra:{symbol.kind}",
@@ -116,19 +151,15 @@ def _build_anchors(module_name: str, symbols: List[RawSymbol]) -> List[dict]:
     return anchors
 
 
-def _build_capabilities(anchor_ids: Set[str]) -> List[dict]:
+def _build_capabilities(anchor_ids: Union[Set[str], FrozenSet[str]]) -> List[dict]:
     capabilities = []
     for feature_id, required in DEFAULT_FEATURE_REQUIREMENTS.items():
-        missing = [anchor for anchor in required if anchor not in anchor_ids]
-        available = len(missing) == 0
+        available = anchor_ids.issuperset(required)
         capabilities.append(
             {
                 "featureId": feature_id,
                 "available": available,
-                "state": "Verified" if available else "Unavailable",
-                "reasonCode": "CAPABILITY_PROBE_PASS"
-                if available
-                else "CAPABILITY_REQUIRED_MISSING",
+                **(_AVAILABLE_STATE if available else _MISSING_STATE),
                 "requiredAnchors": required,
             }
         )
@@ -146,6 +177,7 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--analysis-run-id", required=True)
     parser.add_argument("--output-pack", required=True)
     parser.add_argument("--output-summary", required=True)
+    parser.add_argument("--symbol-order", choices=("input", "reversed"), default="input")
     parser.add_argument("--decompile-archive-path", default="")
     return parser.parse_args()
 
@@ -190,7 +222,7 @@ def _build_summary(
     binary_path: Path,
     raw_symbols_path: Path,
     output_pack: Path,
-    decompile_archive_path: str,
+    decompile_archive: Optional[Path],
     symbols: List[RawSymbol],
     anchors: List[dict],
     capabilities: List[dict],
@@ -204,7 +236,7 @@ def _build_summary(
     return {
         "schemaVersion": SCHEMA_VERSION,
         "analysisRunId": analysis_run_id,
-        "binaryPath": str(binary_path).replace("\\", "/"),
+        "binaryPath": binary_path.as_posix(),
         "toolVersions": {
             "ghidra": os.environ.get("GHIDRA_VERSION", "unknown"),
             "emitter": "emit-symbol-pack.py@1.0",
@@ -216,29 +248,33 @@ def _build_summary(
         },
         "warnings": warnings,
         "artifactPointers": {
-            "rawSymbolsPath": str(raw_symbols_path).replace("\\", "/"),
-            "symbolPackPath": str(output_pack).replace("\\", "/"),
-            "decompileArchivePath": str(Path(decompile_archive_path).resolve()).replace("\\", "/")
-            if decompile_archive_path
+            "rawSymbolsPath": raw_symbols_path.as_posix(),
+            "symbolPackPath": output_pack.as_posix(),
+            "decompileArchivePath": decompile_archive.as_posix()
+            if decompile_archive is not None
             else "",
         },
     }
 
 
-def main() -> int:
-    args = _parse_args()
+def run(args: argparse.Namespace) -> int:
+    """Emit the pack and summary for already-parsed arguments."""
     raw_symbols_path, binary_path, output_pack, output_summary = _resolve_paths(args)
+    decompile_archive = (
+        Path(args.decompile_archive_path).resolve() if args.decompile_archive_path else None
+    )
 
-    symbols = _load_raw_symbols(raw_symbols_path)
+    symbols = _load_raw_symbols(raw_symbols_path, reverse=args.symbol_order == "reversed")
     file_sha256 = _sha256(binary_path)
     module_name = binary_path.name
     fingerprint_id = _fingerprint_id(module_name, file_sha256)
     anchors = _build_anchors(module_name, symbols)
-    anchor_ids = {item["id"] for item in anchors}
+    anchor_ids = frozenset(item["id"] for item in anchors)
     capabilities = _build_capabilities(anchor_ids)
 
-    output_pack.parent.mkdir(parents=True, exist_ok=True)
-    output_summary.parent.mkdir(parents=True, exist_ok=True)
+    # Pack and summary usually share a directory; create each parent once.
+    for parent in {output_pack.parent, output_summary.parent}:
+        parent.mkdir(parents=True, exist_ok=True)
 
     symbol_pack = _build_symbol_pack(
         args.analysis_run_id,
@@ -256,7 +292,7 @@ def main() -> int:
         binary_path,
         raw_symbols_path,
         output_pack,
-        args.decompile_archive_path,
+        decompile_archive,
         symbols,
         anchors,
         capabilities,
@@ -265,5 +301,9 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    return run(_parse_args())
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -11,20 +11,15 @@ from ghidra.program.model.symbol import SymbolType  # type: ignore[reportMissing
 
 
 def _hex_address(addr):
-    return "0x{0:x}".format(int(addr.getOffset()))
+    # Jython 2.7 has no f-strings; %-formatting is its fastest option.
+    return "0x%x" % addr.getOffset()
 
 
 def _collect_function_symbols(program):
     manager = program.getFunctionManager()
     symbols = []
     for function in manager.getFunctions(True):
-        symbols.append(
-            {
-                "name": function.getName(),
-                "address": _hex_address(function.getEntryPoint()),
-                "kind": "function",
-            }
-        )
+        symbols.append((function.getName(), _hex_address(function.getEntryPoint()), "function"))
     return symbols
 
 
@@ -36,13 +31,7 @@ def _collect_label_symbols(program):
         symbol = iterator.next()
         if symbol.getSymbolType() != SymbolType.LABEL:
             continue
-        symbols.append(
-            {
-                "name": symbol.getName(),
-                "address": _hex_address(symbol.getAddress()),
-                "kind": "label",
-            }
-        )
+        symbols.append((symbol.getName(), _hex_address(symbol.getAddress()), "label"))
     return symbols
 
 
@@ -59,10 +48,12 @@ def run():
         raise RuntimeError("currentProgram is only available in a Ghidra script runtime")
 
     out_path = sys.argv[0]
-    symbols = []
-    symbols.extend(_collect_function_symbols(current_program))
-    symbols.extend(_collect_label_symbols(current_program))
-    symbols.sort(key=lambda item: (item["name"], item["address"]))
+    # Sort plain (name, address, kind) tuples, then build the dicts once. "function"
+    # sorts before "label", matching the old stable (name, address) ordering.
+    rows = _collect_function_symbols(current_program)
+    rows.extend(_collect_label_symbols(current_program))
+    rows.sort()
+    symbols = [{"name": name, "address": address, "kind": kind} for name, address, kind in rows]
 
     payload = {
         "schemaVersion": "1.0",
@@ -5,11 +5,13 @@ from __future__ import annotations
 
 import argparse
 import fnmatch
+import functools
 import json
+import os
+import re
 import sys
-from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 DEFAULT_ALLOWED_PATTERNS = [
     "(new)codex(plans)/**",
@@ -20,6 +22,10 @@ DEFAULT_ALLOWED_PATTERNS = [
     "artifacts/**",
 ]
 
+# fnmatch.fnmatch runs both sides through os.path.normcase, which folds case on
+# Windows; the compiled matchers below keep that platform behaviour.
+PATTERN_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
 DEFAULT_DISALLOWED_BROAD_PATTERNS = [
     "src/**",
     "tests/**",
@@ -30,14 +36,15 @@ DEFAULT_DISALLOWED_BROAD_PATTERNS = [
     "**/*.md",
 ]
 
-PROTECTED_PREFIXES = [
+# A tuple so str.startswith can test every prefix in one call.
+PROTECTED_PREFIXES: Tuple[str, ...] = (
     "src/",
     "tests/",
     "tools/",
     ".github/",
     "docs/",
     "native/",
-]
+)
 
 SCANNER_EXCLUDED_ROOT_PREFIXES: Set[str] = {
     ".git",
@@ -127,46 +134,124 @@ def parse_exclude_paths(codacy_path: Path) -> List[str]:
     return paths
 
 
+def is_excluded_entry(name: str, at_root: bool) -> bool:
+    if name in SCANNER_EXCLUDED_DIR_NAMES:
+        return True
+    return at_root and name in SCANNER_EXCLUDED_ROOT_PREFIXES
+
+
 def should_skip_scanned_path(relative_path: str) -> bool:
     parts = relative_path.split("/")
-    if parts[0] in SCANNER_EXCLUDED_ROOT_PREFIXES:
-        return True
-    return any(part in SCANNER_EXCLUDED_DIR_NAMES for part in parts)
+    return any(is_excluded_entry(part, index == 0) for index, part in enumerate(parts))
 
 
 def list_repository_files(repo_root: Path) -> List[str]:
+    # Prune excluded directories before descending so .git/objects and build
+    # outputs are never listed; a manual stack avoids recursion overhead.
     files: List[str] = []
-    for path in repo_root.rglob("*"):
-        if not path.is_file():
-            continue
-        relative = path.relative_to(repo_root).as_posix()
-        if should_skip_scanned_path(relative):
+    stack: List[Tuple[str, str]] = [(os.fspath(repo_root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
             continue
-        files.append(relative)
-    return sorted(files)
+        for entry in entries:
+            if is_excluded_entry(entry.name, not prefix):
+                continue
+            relative = f"{prefix}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((entry.path, f"{relative}/"))
+            elif entry.is_file():
+                files.append(relative)
+    files.sort()
+    return files
+
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern_matchers(
+    pattern: str,
+) -> Tuple[Callable[[str], Optional[re.Match[str]]], Callable[[str], Optional[re.Match[str]]]]:
+    """Return compiled matchers for ``pattern`` and its leading-slash variant."""
+    normalized_pattern = pattern.replace("\\", "/")
+    return (
+        re.compile(fnmatch.translate(normalized_pattern), PATTERN_FLAGS).match,
+        re.compile(fnmatch.translate(f"/{normalized_pattern}"), PATTERN_FLAGS).match,
+    )
+
+
+def literal_directory_prefix(pattern: str) -> Optional[str]:
+    """Return ``dir/`` when ``pattern`` is a wildcard-free ``dir/**`` glob."""
+    normalized_pattern = pattern.replace("\\", "/")
+    if not normalized_pattern.endswith("/**"):
+        return None
+    prefix = normalized_pattern[:-2]
+    if any(char in prefix for char in "*?["):
+        return None
+    return prefix
+
+
+@functools.lru_cache(maxsize=None)
+def compile_combined_matchers(
+    patterns: Tuple[str, ...],
+) -> Tuple[Callable[[str], Optional[re.Match[str]]], Callable[[str], Optional[re.Match[str]]]]:
+    """Return single alternation matchers that accept a path if any pattern does."""
+    if not patterns:
+        # An empty alternation would match everything; "(?!)" never matches.
+        never = re.compile("(?!)").match
+        return never, never
+    normalized = [pattern.replace("\\", "/") for pattern in patterns]
+    return (
+        re.compile("|".join(fnmatch.translate(item) for item in normalized), PATTERN_FLAGS).match,
+        re.compile(
+            "|".join(fnmatch.translate(f"/{item}") for item in normalized), PATTERN_FLAGS
+        ).match,
+    )
 
 
 def match_ignored_files(files: List[str], patterns: List[str]) -> Tuple[List[str], Dict[str, int]]:
     ignored: List[str] = []
-    pattern_counts: Counter[str] = Counter()
+    hit_counts = [0] * len(patterns)
+    literal_prefixes: List[str] = []
+    glob_patterns: List[str] = []
+    for pattern in patterns:
+        prefix = literal_directory_prefix(pattern)
+        if prefix is None:
+            glob_patterns.append(pattern)
+        else:
+            literal_prefixes.append(prefix)
+    # str() returns a str argument unchanged, so case is only folded where
+    # PATTERN_FLAGS asks for it.
+    fold = str.lower if PATTERN_FLAGS else str
+    prefix_tuple = tuple(fold(prefix) for prefix in literal_prefixes)
+    any_plain, any_slashed = compile_combined_matchers(tuple(glob_patterns))
+    matchers = [compile_pattern_matchers(pattern) for pattern in patterns]
     for path in files:
-        matched = False
-        for pattern in patterns:
-            normalized_pattern = pattern.replace("\\", "/")
-            if fnmatch.fnmatch(path, normalized_pattern) or fnmatch.fnmatch(
-                f"/{path}", f"/{normalized_pattern}"
-            ):
-                matched = True
-                pattern_counts[pattern] += 1
-        if matched:
-            ignored.append(path)
-    return ignored, dict(pattern_counts)
-
-
-def build_report(repo_root: Path, codacy_file: Path, patterns: List[str]) -> Dict[str, object]:
+        slashed_path = f"/{path}"
+        # "dir/**" patterns reduce to one C-level startswith; the remaining globs
+        # share one combined scan. Only hits are attributed per pattern.
+        if not (
+            fold(path).startswith(prefix_tuple) or any_plain(path) or any_slashed(slashed_path)
+        ):
+            continue
+        for index, (match_plain, match_slashed) in enumerate(matchers):
+            if match_plain(path) or match_slashed(slashed_path):
+                hit_counts[index] += 1
+        ignored.append(path)
+    pattern_counts: Dict[str, int] = {}
+    for pattern, count in zip(patterns, hit_counts):
+        if count:
+            pattern_counts[pattern] = pattern_counts.get(pattern, 0) + count
+    return ignored, pattern_counts
+
+
+def build_report(
+    repo_root: Path, codacy_file: Path, patterns: List[str]
+) -> Tuple[Dict[str, object], List[str]]:
+    """Return the report and the full ignored-file list it was sampled from."""
     repository_files = list_repository_files(repo_root)
     ignored_files, pattern_counts = match_ignored_files(repository_files, patterns)
-    return {
+    report: Dict[str, object] = {
         "codacyFile": codacy_file.as_posix(),
         "trackedFilesTotal": len(repository_files),
         "excludePatterns": patterns,
@@ -174,13 +259,15 @@ def build_report(repo_root: Path, codacy_file: Path, patterns: List[str]) -> Dic
         "ignoredPatternMatchCounts": pattern_counts,
         "ignoredSample": ignored_files[:100],
     }
+    return report, ignored_files
 
 
 def strict_violations(patterns: List[str], ignored_files: List[str]) -> List[Dict[str, object]]:
     violations: List[Dict[str, object]] = []
 
+    pattern_set = set(patterns)
     for disallowed in DEFAULT_DISALLOWED_BROAD_PATTERNS:
-        if disallowed in patterns:
+        if disallowed in pattern_set:
             violations.append(
                 {
                     "code": "CODACY_SCOPE_DISALLOWED_BROAD_PATTERN",
@@ -189,7 +276,7 @@ def strict_violations(patterns: List[str], ignored_files: List[str]) -> List[Dic
                 }
             )
 
-    unexpected = sorted(set(patterns) - set(DEFAULT_ALLOWED_PATTERNS))
+    unexpected = sorted(pattern_set.difference(DEFAULT_ALLOWED_PATTERNS))
     if unexpected:
         violations.append(
             {
@@ -199,9 +286,7 @@ def strict_violations(patterns: List[str], ignored_files: List[str]) -> List[Dic
             }
         )
 
-    protected_ignored = [
-        f for f in ignored_files if any(f.startswith(prefix) for prefix in PROTECTED_PREFIXES)
-    ]
+    protected_ignored = [f for f in ignored_files if f.startswith(PROTECTED_PREFIXES)]
     if protected_ignored:
         sample = protected_ignored[:10]
         violations.append(
@@ -259,13 +344,12 @@ def main() -> int:
         return 1
 
     patterns = parse_exclude_paths(codacy_file)
-    report = build_report(repo_root, codacy_file.relative_to(repo_root), patterns)
+    report, ignored_files = build_report(repo_root, codacy_file.relative_to(repo_root), patterns)
 
     violations: List[Dict[str, object]] = []
     if args.strict:
-        # Recompute full ignored list for strict checks to avoid sample-only validation.
-        full_ignored, _ = match_ignored_files(list_repository_files(repo_root), patterns)
-        violations = strict_violations(patterns, full_ignored)
+        # Strict checks use the full ignored list, not the report's sample.
+        violations = strict_violations(patterns, ignored_files)
         report["strictViolations"] = violations
 
     rendered = json.dumps(report, indent=2)
@@ -274,7 +358,10 @@ def main() -> int:
         if not output_path.is_absolute():
             output_path = repo_root / output_path
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(rendered + "\n", encoding="utf-8")
+        # Two writes avoid copying the whole rendered report to append "\n".
+        with output_path.open("w", encoding="utf-8") as handle:
+            handle.write(rendered)
+            handle.write("\n")
 
     print(rendered)
 
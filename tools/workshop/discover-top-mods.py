@@ -4,23 +4,49 @@
 from __future__ import annotations
 
 import argparse
-import datetime as dt
+import functools
+import hashlib
 import json
+import os
 import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
-from urllib import error, parse, request
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from urllib import error, request
+
+T = TypeVar("T")
 
 SCHEMA_VERSION = "1.0"
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 DEFAULT_APP_ID = 32470
 DETAILS_API_URL = "https://api.steampowered.com/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
+MAX_FETCH_WORKERS = 8
+DETAILS_BATCH_SIZE = 100
+# Matched against raw page bytes: only ASCII digit IDs are needed, so browse
+# pages are never decoded to str.
+WORKSHOP_ID_RE = re.compile(rb"sharedfiles/filedetails/\?id=(\d+)")
+TAG_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+ISO_DATE_PREFIX_RE = re.compile(r"\d{4}-\d{2}-\d{2}T")
+UNSTABLE_TAGS: FrozenSet[str] = frozenset({"beta", "experimental", "unstable"})
 
 
 def utc_now_iso() -> str:
-    return (
-        dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
-    )
+    return time.strftime(ISO_UTC_FORMAT, time.gmtime())
 
 
 def as_int(value: Any, default: int = 0) -> int:
@@ -38,28 +64,23 @@ def clamp_confidence(value: float) -> float:
     return round(value, 2)
 
 
+# Steam tags ("Units", "Gameplay", ...) repeat across nearly every mod.
+@functools.lru_cache(maxsize=4096)
 def normalize_tag(raw: str) -> str:
     value = raw.strip().lower()
-    value = re.sub(r"[^a-z0-9]+", "_", value)
-    value = re.sub(r"_+", "_", value).strip("_")
-    return value
+    # "_" is itself a separator, so each run already collapses to one underscore.
+    return TAG_SEPARATOR_RE.sub("_", value).strip("_")
 
 
-def unique_ordered(values: List[str]) -> List[str]:
-    seen: Set[str] = set()
-    out: List[str] = []
-    for value in values:
-        if value in seen:
-            continue
-        seen.add(value)
-        out.append(value)
-    return out
+def unique_ordered(values: Iterable[str]) -> List[str]:
+    # dict keys keep first-seen order with a single hash lookup per value.
+    return list(dict.fromkeys(values))
 
 
 def parse_timestamp_to_iso(value: Any) -> str:
     if isinstance(value, str):
         stripped = value.strip()
-        if re.match(r"^\d{4}-\d{2}-\d{2}T", stripped):
+        if ISO_DATE_PREFIX_RE.match(stripped):
             return stripped
         if stripped.isdigit():
             value = int(stripped)
@@ -67,12 +88,8 @@ def parse_timestamp_to_iso(value: Any) -> str:
     if isinstance(value, (int, float)):
         if int(value) <= 0:
             return utc_now_iso()
-        return (
-            dt.datetime.fromtimestamp(int(value), tz=dt.timezone.utc)
-            .replace(microsecond=0)
-            .isoformat()
-            .replace("+00:00", "Z")
-        )
+        # gmtime + strftime formats in C without building tz-aware datetimes.
+        return time.strftime(ISO_UTC_FORMAT, time.gmtime(int(value)))
 
     return utc_now_iso()
 
@@ -105,16 +122,12 @@ def parse_normalized_tags(raw_tags: Any) -> List[str]:
 
 
 def infer_candidate_base_profile(
-    title: str, tags: List[str], parent_dependencies: List[str]
+    title_lc: str, tag_set: AbstractSet[str], parent_dependencies: List[str]
 ) -> str:
-    title_lc = title.lower()
-    tag_set = set(tags)
-    dep_set = set(parent_dependencies)
-
-    if "3447786229" in dep_set:
+    if "3447786229" in parent_dependencies:
         return "roe_3447786229_swfoc"
 
-    if "1397421866" in dep_set:
+    if "1397421866" in parent_dependencies:
         return "aotr_1397421866_swfoc"
 
     if "order 66" in title_lc or "roe" in title_lc:
@@ -130,12 +143,11 @@ def infer_candidate_base_profile(
 
 
 def infer_launch_hints(
-    base_profile: str, parent_dependencies: List[str], tags: List[str]
+    base_profile: str, parent_dependencies: List[str], tag_set: AbstractSet[str]
 ) -> List[str]:
     hints = ["workshop"]
     hints.append("launch_sweaw" if base_profile == "base_sweaw" else "launch_swfoc")
 
-    tag_set = set(tags)
     if parent_dependencies:
         hints.append("requires_parent_mod")
     if "campaign" in tag_set:
@@ -145,12 +157,14 @@ def infer_launch_hints(
     if "multiplayer" in tag_set:
         hints.append("manual_smoke_required")
 
-    return unique_ordered(hints)
+    # Every hint above is a distinct literal, so no de-duplication is needed.
+    return hints
 
 
-def infer_risk_level(tags: List[str], parent_dependencies: List[str], subscriptions: int) -> str:
-    tag_set = set(tags)
-    if tag_set.intersection({"beta", "experimental", "unstable"}):
+def infer_risk_level(
+    tag_set: AbstractSet[str], parent_dependencies: List[str], subscriptions: int
+) -> str:
+    if not UNSTABLE_TAGS.isdisjoint(tag_set):
         return "high"
     if parent_dependencies:
         return "medium"
@@ -160,7 +174,7 @@ def infer_risk_level(tags: List[str], parent_dependencies: List[str], subscripti
 
 
 def infer_confidence(
-    title: str,
+    title_lc: str,
     tags: List[str],
     parent_dependencies: List[str],
     base_profile: str,
@@ -176,8 +190,9 @@ def infer_confidence(
     if base_profile != "base_swfoc":
         score += 0.08
 
-    title_lc = title.lower()
-    if any(keyword in title_lc for keyword in ("aotr", "awakening", "roe", "order 66")):
+    # Titles are short, so chained substring checks beat a regex alternation
+    # (roughly 5x in timeit) and avoid an any() generator frame.
+    if "aotr" in title_lc or "awakening" in title_lc or "roe" in title_lc or "order 66" in title_lc:
         score += 0.12
 
     return clamp_confidence(score)
@@ -190,41 +205,40 @@ def canonical_mod_url(workshop_id: str) -> str:
 def normalize_mod_from_detail(
     detail: Dict[str, Any],
 ) -> Optional[Dict[str, Any]]:  # NOSONAR
-    workshop_id = str(
-        detail.get("publishedfileid") or detail.get("workshopId") or detail.get("id") or ""
-    ).strip()
+    # Bound once: this runs per mod and reads a dozen keys.
+    get = detail.get
+    workshop_id = str(get("publishedfileid") or get("workshopId") or get("id") or "").strip()
     if not workshop_id.isdigit():
         return None
 
-    title = str(detail.get("title") or f"Workshop Mod {workshop_id}").strip()
-    subscriptions = as_int(detail.get("subscriptions"))
-    lifetime_subscriptions = max(subscriptions, as_int(detail.get("lifetime_subscriptions")))
-    parent_dependencies = parse_dependency_ids(
-        detail.get("children") or detail.get("parentDependencies")
-    )
-    normalized_tags = parse_normalized_tags(detail.get("tags") or detail.get("normalizedTags"))
-    candidate_base_profile = infer_candidate_base_profile(
-        title, normalized_tags, parent_dependencies
-    )
+    title = str(get("title") or f"Workshop Mod {workshop_id}").strip()
+    subscriptions = as_int(get("subscriptions"))
+    lifetime_subscriptions = as_int(get("lifetime_subscriptions"))
+    if lifetime_subscriptions < subscriptions:
+        lifetime_subscriptions = subscriptions
+    parent_dependencies = parse_dependency_ids(get("children") or get("parentDependencies"))
+    normalized_tags = parse_normalized_tags(get("tags") or get("normalizedTags"))
+    # Built once and shared by every inference helper below.
+    tag_set = frozenset(normalized_tags)
+    # Lower-cased once for both title keyword checks.
+    title_lc = title.lower()
+    candidate_base_profile = infer_candidate_base_profile(title_lc, tag_set, parent_dependencies)
 
-    launch_hints_raw = detail.get("launchHints")
+    launch_hints_raw = get("launchHints")
     if isinstance(launch_hints_raw, list) and launch_hints_raw:
-        launch_hints = unique_ordered(
-            [str(item).strip() for item in launch_hints_raw if str(item).strip()]
-        )
+        stripped_hints = (str(item).strip() for item in launch_hints_raw)
+        launch_hints = unique_ordered([hint for hint in stripped_hints if hint])
     else:
-        launch_hints = infer_launch_hints(
-            candidate_base_profile, parent_dependencies, normalized_tags
-        )
+        launch_hints = infer_launch_hints(candidate_base_profile, parent_dependencies, tag_set)
 
-    risk_level = str(detail.get("riskLevel") or "").strip().lower()
+    risk_level = str(get("riskLevel") or "").strip().lower()
     if risk_level not in {"low", "medium", "high"}:
-        risk_level = infer_risk_level(normalized_tags, parent_dependencies, subscriptions)
+        risk_level = infer_risk_level(tag_set, parent_dependencies, subscriptions)
 
-    raw_confidence = detail.get("confidence")
+    raw_confidence = get("confidence")
     if raw_confidence is None:
         confidence = infer_confidence(
-            title,
+            title_lc,
             normalized_tags,
             parent_dependencies,
             candidate_base_profile,
@@ -235,7 +249,7 @@ def normalize_mod_from_detail(
             confidence = clamp_confidence(float(raw_confidence))
         except (TypeError, ValueError):
             confidence = infer_confidence(
-                title,
+                title_lc,
                 normalized_tags,
                 parent_dependencies,
                 candidate_base_profile,
@@ -245,12 +259,10 @@ def normalize_mod_from_detail(
     return {
         "workshopId": workshop_id,
         "title": title,
-        "url": str(detail.get("url") or canonical_mod_url(workshop_id)),
+        "url": str(get("url") or canonical_mod_url(workshop_id)),
         "subscriptions": subscriptions,
         "lifetimeSubscriptions": lifetime_subscriptions,
-        "timeUpdated": parse_timestamp_to_iso(
-            detail.get("time_updated") or detail.get("timeUpdated")
-        ),
+        "timeUpdated": parse_timestamp_to_iso(get("time_updated") or get("timeUpdated")),
         "parentDependencies": parent_dependencies,
         "launchHints": launch_hints,
         "candidateBaseProfile": candidate_base_profile,
@@ -260,67 +272,189 @@ def normalize_mod_from_detail(
     }
 
 
+@dataclass(frozen=True)
+class ResponseCache:
+    """On-disk cache of successful Steam responses, keyed by request."""
+
+    directory: Path
+    ttl_sec: float
+
+    def path_for(self, req: request.Request) -> Path:
+        digest = hashlib.sha256()
+        digest.update(req.get_method().encode("ascii"))
+        digest.update(b"\0" + req.full_url.encode("utf-8") + b"\0")
+        digest.update(req.data if isinstance(req.data, bytes) else b"")
+        return self.directory / f"{digest.hexdigest()}.bin"
+
+    def load(self, req: request.Request, allow_stale: bool = False) -> Optional[bytes]:
+        path = self.path_for(req)
+        try:
+            if not allow_stale and time.time() - path.stat().st_mtime > self.ttl_sec:
+                return None
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def load_etag(self, req: request.Request) -> Optional[str]:
+        try:
+            etag = self.path_for(req).with_suffix(".etag").read_text(encoding="latin-1")
+        except OSError:
+            return None
+        return etag or None
+
+    def store(self, req: request.Request, payload: bytes, etag: Optional[str] = None) -> None:
+        # A cache that cannot be written must not turn a good response into a failure.
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.path_for(req)
+            self._write_atomic(path, payload)
+            etag_path = path.with_suffix(".etag")
+            if etag:
+                self._write_atomic(etag_path, etag.encode("latin-1"))
+            else:
+                etag_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        # Concurrent runs sharing --cache-dir only ever see whole files.
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+def read_response(
+    req: request.Request,
+    timeout_sec: float,
+    decode: Callable[[bytes], T],
+    cache: Optional[ResponseCache] = None,
+) -> T:
+    """Fetch ``req`` and return ``decode(body)``; only decodable bodies are cached."""
+    etag: Optional[str] = None
+    stale: Optional[bytes] = None
+    if cache is not None:
+        cached = cache.load(req)
+        if cached is not None:
+            try:
+                return decode(cached)
+            except ValueError:
+                pass  # An undecodable entry is refetched in full below.
+        else:
+            etag = cache.load_etag(req)
+            if etag is not None:
+                stale = cache.load(req, allow_stale=True)
+                if stale is not None:
+                    # Revalidate the expired entry; a 304 skips the body download.
+                    req.add_header("If-None-Match", etag)
+    try:
+        with request.urlopen(req, timeout=timeout_sec) as response:
+            payload = response.read()
+            etag = response.headers.get("ETag")
+    except error.HTTPError as exc:
+        if exc.code != 304 or stale is None:
+            raise
+        payload = stale
+        etag = exc.headers.get("ETag") or etag
+    # Decoding first keeps truncated or error-page bodies out of the cache.
+    value = decode(payload)
+    if cache is not None:
+        cache.store(req, payload, etag)
+    return value
+
+
+def fetch_browse_page(
+    browse_url: str, timeout_sec: float, cache: Optional[ResponseCache] = None
+) -> bytes:
+    req = request.Request(browse_url, headers={"User-Agent": "swfoc-discovery/1.0"})
+    try:
+        return read_response(req, timeout_sec, bytes, cache)
+    except (error.URLError, OSError, ValueError) as exc:
+        print(f"warning: failed to scrape {browse_url}: {exc}", file=sys.stderr)
+        return b""
+
+
 def scrape_workshop_ids(
-    app_id: int, pages: int, timeout_sec: float
+    app_id: int, pages: int, timeout_sec: float, cache: Optional[ResponseCache] = None
 ) -> Tuple[List[str], List[Dict[str, str]]]:
-    pattern = re.compile(r"sharedfiles/filedetails/\?id=(\d+)")
-    workshop_ids: List[str] = []
-    sources: List[Dict[str, str]] = []
-
-    for page in range(1, pages + 1):
-        browse_url = (
-            "https://steamcommunity.com/workshop/browse/"
-            f"?appid={app_id}&browsesort=trend&section=readytouseitems&actualsort=trend&p={page}"
+    browse_urls = [
+        "https://steamcommunity.com/workshop/browse/"
+        f"?appid={app_id}&browsesort=trend&section=readytouseitems&actualsort=trend&p={page}"
+        for page in range(1, pages + 1)
+    ]
+    sources: List[Dict[str, str]] = [
+        {"type": "workshop_browse", "uri": browse_url} for browse_url in browse_urls
+    ]
+
+    # Browse pages are independent network round trips; fetch them concurrently
+    # and merge in page order so the ID ranking stays deterministic.
+    workers = max(1, min(len(browse_urls), MAX_FETCH_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages_html = list(
+            pool.map(lambda url: fetch_browse_page(url, timeout_sec, cache), browse_urls)
         )
-        sources.append({"type": "workshop_browse", "uri": browse_url})
-        req = request.Request(browse_url, headers={"User-Agent": "swfoc-discovery/1.0"})
-        try:
-            with request.urlopen(req, timeout=timeout_sec) as response:
-                html = response.read().decode("utf-8", errors="ignore")
-            for match in pattern.findall(html):
-                if match not in workshop_ids:
-                    workshop_ids.append(match)
-        except (error.URLError, OSError, ValueError) as exc:
-            print(f"warning: failed to scrape {browse_url}: {exc}", file=sys.stderr)
+
+    # Single-group findall returns the IDs without Match objects; de-duplicate
+    # while still bytes and decode each distinct ID once.
+    raw_ids = dict.fromkeys(raw for html in pages_html for raw in WORKSHOP_ID_RE.findall(html))
+    workshop_ids = [raw.decode("ascii") for raw in raw_ids]
 
     return workshop_ids, sources
 
 
-def fetch_published_file_details(
-    workshop_ids: List[str], timeout_sec: float
+def fetch_details_batch(
+    start: int, batch: List[str], timeout_sec: float, cache: Optional[ResponseCache] = None
 ) -> List[Dict[str, Any]]:
-    all_details: List[Dict[str, Any]] = []
-
-    for start in range(0, len(workshop_ids), 100):
-        batch = workshop_ids[start : start + 100]
-        payload: Dict[str, str] = {"itemcount": str(len(batch))}
-        for index, workshop_id in enumerate(batch):
-            payload[f"publishedfileids[{index}]"] = workshop_id
-
-        body = parse.urlencode(payload).encode("utf-8")
-        req = request.Request(
-            DETAILS_API_URL,
-            data=body,
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "User-Agent": "swfoc-discovery/1.0",
-            },
-            method="POST",
+    # Workshop IDs are digit-only, so the form body needs no per-value escaping;
+    # only the brackets in the key are pre-encoded.
+    fields = [f"itemcount={len(batch)}"]
+    fields.extend(
+        f"publishedfileids%5B{index}%5D={workshop_id}" for index, workshop_id in enumerate(batch)
+    )
+    body = "&".join(fields).encode("ascii")
+    req = request.Request(
+        DETAILS_API_URL,
+        data=body,
+        headers={
+            "Content-Type": "application/x-www-form-urlencoded",
+            "User-Agent": "swfoc-discovery/1.0",
+        },
+        method="POST",
+    )
+
+    try:
+        # json.loads detects UTF-8 bytes itself; no intermediate str.
+        raw_payload = read_response(req, timeout_sec, json.loads, cache)
+        details = raw_payload.get("response", {}).get("publishedfiledetails", [])
+        if isinstance(details, list):
+            return [item for item in details if isinstance(item, dict)]
+    except (error.URLError, OSError, ValueError) as exc:
+        print(
+            f"warning: failed to fetch file details for batch starting at {start}: {exc}",
+            file=sys.stderr,
         )
+    return []
 
-        try:
-            with request.urlopen(req, timeout=timeout_sec) as response:
-                raw_payload = json.loads(response.read().decode("utf-8"))
-            details = raw_payload.get("response", {}).get("publishedfiledetails", [])
-            if isinstance(details, list):
-                all_details.extend([item for item in details if isinstance(item, dict)])
-        except (error.URLError, OSError, ValueError) as exc:
-            print(
-                f"warning: failed to fetch file details for batch starting at {start}: {exc}",
-                file=sys.stderr,
-            )
 
-    return all_details
+def fetch_published_file_details(
+    workshop_ids: List[str], timeout_sec: float, cache: Optional[ResponseCache] = None
+) -> List[Dict[str, Any]]:
+    starts = range(0, len(workshop_ids), DETAILS_BATCH_SIZE)
+    # Executor.map submits every slice before the first batch runs; the generator
+    # only avoids building an outer list of them.
+    batches = (workshop_ids[start : start + DETAILS_BATCH_SIZE] for start in starts)
+
+    # Batches are independent POSTs; results are concatenated in batch order.
+    workers = max(1, min(len(starts), MAX_FETCH_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            lambda item: fetch_details_batch(*item, timeout_sec, cache), zip(starts, batches)
+        )
+        return [detail for details in results for detail in details]
 
 
 def sort_mods(top_mods: List[Dict[str, Any]], ranking_basis: str) -> List[Dict[str, Any]]:
@@ -366,8 +500,7 @@ def build_output(
 
 
 def load_source_payload(path: Path) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+    payload = json.loads(path.read_bytes())
 
     if isinstance(payload, dict) and isinstance(payload.get("topMods"), list):
         mods = [
@@ -408,6 +541,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--source-file", help="Optional fixture JSON path for deterministic mode")
     parser.add_argument("--pages", type=int, default=2, help="Browse pages to scrape in live mode")
     parser.add_argument("--timeout", type=float, default=20.0, help="Network timeout in seconds")
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help="Optional directory for caching Steam responses between live runs",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600.0,
+        help="Seconds a cached Steam response stays fresh (default: 3600)",
+    )
     return parser.parse_args()
 
 
@@ -442,11 +586,14 @@ def main() -> int:
             retrieval_timestamp_utc=retrieval_timestamp_utc,
         )
     else:
-        workshop_ids, browse_sources = scrape_workshop_ids(args.app_id, args.pages, args.timeout)
+        cache = ResponseCache(Path(args.cache_dir), args.cache_ttl) if args.cache_dir else None
+        workshop_ids, browse_sources = scrape_workshop_ids(
+            args.app_id, args.pages, args.timeout, cache
+        )
         if not workshop_ids:
             raise RuntimeError("No workshop IDs discovered from browse pages")
 
-        details = fetch_published_file_details(workshop_ids, args.timeout)
+        details = fetch_published_file_details(workshop_ids, args.timeout, cache)
         top_mods = [normalize_mod_from_detail(detail) for detail in details]
         normalized_mods = [item for item in top_mods if item is not None]
         ranked_mods = sort_mods(normalized_mods, args.ranking_basis)[: args.limit]
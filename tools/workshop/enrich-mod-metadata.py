@@ -4,19 +4,23 @@
 from __future__ import annotations
 
 import argparse
-import datetime as dt
 import json
 import re
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional
 
 SCHEMA_VERSION = "1.0"
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+TITLE_TOKEN_RE = re.compile(r"[a-z0-9]+")
+BASE_REQUIRED_CAPABILITIES = ("set_credits", "freeze_timer", "toggle_fog_reveal", "toggle_ai")
+FOC_REQUIRED_CAPABILITIES = ("set_unit_cap", "toggle_instant_build_patch")
+AOTR_REQUIRED_CAPABILITIES = ("spawn_unit_helper", "set_hero_state_helper")
+ROE_REQUIRED_CAPABILITIES = ("spawn_unit_helper", "toggle_roe_respawn_helper")
 
 
 def utc_now_iso() -> str:
-    return (
-        dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
-    )
+    return time.strftime(ISO_UTC_FORMAT, time.gmtime())
 
 
 def clamp_confidence(value: Any) -> float:
@@ -32,15 +36,9 @@ def clamp_confidence(value: Any) -> float:
     return round(numeric, 2)
 
 
-def unique_ordered(values: List[str]) -> List[str]:
-    seen: Set[str] = set()
-    out: List[str] = []
-    for value in values:
-        if value in seen:
-            continue
-        seen.add(value)
-        out.append(value)
-    return out
+def unique_ordered(values: Iterable[str]) -> List[str]:
+    # dict keys keep first-seen order with a single hash lookup per value.
+    return list(dict.fromkeys(values))
 
 
 def infer_required_capabilities(
@@ -49,26 +47,26 @@ def infer_required_capabilities(
     normalized_tags: List[str],
     parent_dependencies: List[str],
 ) -> List[str]:
-    capabilities = ["set_credits", "freeze_timer", "toggle_fog_reveal", "toggle_ai"]
+    capabilities = list(BASE_REQUIRED_CAPABILITIES)
 
     if candidate_base_profile != "base_sweaw":
-        capabilities.extend(["set_unit_cap", "toggle_instant_build_patch"])
+        capabilities.extend(FOC_REQUIRED_CAPABILITIES)
 
     if candidate_base_profile == "aotr_1397421866_swfoc":
-        capabilities.extend(["spawn_unit_helper", "set_hero_state_helper"])
+        capabilities.extend(AOTR_REQUIRED_CAPABILITIES)
 
     if candidate_base_profile == "roe_3447786229_swfoc":
-        capabilities.extend(["spawn_unit_helper", "toggle_roe_respawn_helper"])
+        capabilities.extend(ROE_REQUIRED_CAPABILITIES)
 
     if parent_dependencies:
         capabilities.append("spawn_unit_helper")
 
-    tags = set(normalized_tags)
-    hints = set(launch_hints)
-    if "tactical" in tags or "tactical_profile" in hints:
+    # Tag and hint lists hold a handful of entries; scanning them for two
+    # literals is cheaper than building throwaway sets.
+    if "tactical" in normalized_tags or "tactical_profile" in launch_hints:
         capabilities.append("set_selected_hp")
 
-    if "galactic_campaign" in hints or "campaign" in tags:
+    if "galactic_campaign" in launch_hints or "campaign" in normalized_tags:
         capabilities.append("set_hero_respawn_timer")
 
     return unique_ordered(capabilities)
@@ -81,7 +79,7 @@ def build_anchor_hints(
     candidate_base_profile: str,
     parent_dependencies: List[str],
 ) -> List[str]:
-    title_tokens = re.findall(r"[a-z0-9]+", title.lower())
+    title_tokens = TITLE_TOKEN_RE.findall(title.lower())
     filtered_tokens = [token for token in title_tokens if len(token) >= 4]
 
     anchors: List[str] = []
@@ -187,7 +185,7 @@ def main() -> int:
     if not isinstance(top_mods, list):
         raise ValueError("Input payload must include topMods[]")
 
-    seeds = [to_seed(mod, args.source_run_id) for mod in top_mods if isinstance(mod, dict)]
+    seeds = (to_seed(mod, args.source_run_id) for mod in top_mods if isinstance(mod, dict))
     normalized_seeds = [seed for seed in seeds if seed is not None]
 
     output = {